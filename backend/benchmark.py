@@ -0,0 +1,115 @@
+"""
+Per-request latency of the recursive tree-model forecast path.
+
+Compares the original path (full-frame county scan, then a one-row
+feature DataFrame + model.predict per month) against forecast_ev_demand
+on the indexed CountyStore with the FeatureBuffer engine, at horizons
+12 / 36 / 120.
+
+Run from backend/:
+    python benchmark.py --model xgboost --county King --repeat 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from county_store import STORE_COLUMNS, CountyStore
+from data_io import load_dataset
+from feature_config import FEATURE_COLUMNS
+from features import window_features
+from forecasting import forecast_ev_demand
+from model_loader import load_xgboost, load_random_forest
+
+HORIZONS = [12, 36, 120]
+
+
+def legacy_tree_forecast(df, county, model, horizon):
+    """
+    The pre-FeatureBuffer recursion, kept as the baseline: a DataFrame
+    scan per request and a one-row DataFrame per month (its features
+    now from the shared window_features).
+    """
+    county_df = (
+        df[df["County"].str.lower() == county.lower()]
+        .sort_values("Date")
+        .reset_index(drop=True)
+    )
+    historical_df = county_df.tail(24)
+
+    last_date = pd.to_datetime(historical_df["Date"].max())
+    months_since_start = int(county_df["months_since_start"].max())
+    county_encoded = int(county_df["county_encoded"].iloc[0])
+
+    historical_values = list(
+        historical_df["Electric Vehicle (EV) Total"].values[-6:]
+    )
+
+    preds = []
+
+    for step in range(1, horizon + 1):
+        future_date = last_date + pd.DateOffset(months=step)
+
+        row = [months_since_start + step, future_date.year, future_date.month, county_encoded]
+        row += window_features(np.array([historical_values], dtype=np.float64))[0].tolist()
+        features = pd.DataFrame([dict(zip(FEATURE_COLUMNS, row))])
+
+        pred = max(0, int(round(model.predict(features)[0])))
+        preds.append(pred)
+
+        historical_values.append(pred)
+        historical_values.pop(0)
+
+    return preds
+
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, np.array(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="xgboost", choices=["xgboost", "random_forest"])
+    parser.add_argument("--county", default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    df = load_dataset(STORE_COLUMNS)
+    store = CountyStore(df)
+    county = args.county or df["County"].value_counts().index[0]
+    model = load_xgboost() if args.model == "xgboost" else load_random_forest()
+
+    print(f"model={args.model} county={county} repeat={args.repeat}")
+    print(f"{'horizon':>8} {'legacy ms':>12} {'engine ms':>12} {'speedup':>9} {'mismatch':>9}")
+
+    for horizon in HORIZONS:
+        legacy, legacy_ms = time_call(
+            lambda: legacy_tree_forecast(df, county, model, horizon),
+            args.repeat,
+        )
+        result, engine_ms = time_call(
+            lambda: forecast_ev_demand(store, county, args.model, horizon),
+            args.repeat,
+        )
+
+        engine = result["forecast"]
+        mismatch = sum(a != b for a, b in zip(legacy, engine))
+
+        print(
+            f"{horizon:>8} "
+            f"{np.median(legacy_ms):>12.2f} "
+            f"{np.median(engine_ms):>12.2f} "
+            f"{np.median(legacy_ms) / np.median(engine_ms):>8.1f}x "
+            f"{mismatch:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
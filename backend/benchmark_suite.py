@@ -0,0 +1,600 @@
+"""
+End-to-end benchmark suite on synthetic data and stand-in models.
+
+Builds a throwaway data/ + models/ tree (synthetic county series, small
+XGBoost / RandomForest / Prophet / LSTM models trained on it), points the
+backend at it through EV_BASE_DIR, and measures:
+
+- latency:    forecast_ev_demand per model and horizon
+- throughput: concurrent POST /forecast through an in-process ASGI client,
+              with the forecast cache on and off
+- startup:    `import main` in a fresh interpreter
+- memory:     peak RSS of a fresh interpreter after model_loader loads
+              each model
+- parity:     flattened TreeEnsemble predictions against sklearn /
+              XGBoost predict (single and multi-output, quantile, NaN
+              inputs), and serving's FeatureBuffer steps against the
+              training features; any mismatch beyond tolerance fails
+              the run
+
+Results are written as JSON to compare across commits.
+
+Run from backend/:
+    python benchmark_suite.py --out bench.json
+    python benchmark_suite.py --models xgboost,random_forest --quick
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MODELS = ["xgboost", "random_forest", "prophet", "lstm"]
+HORIZONS = [12, 36, 120]
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Backend modules resolve their paths at import time, so everything that
+# touches them is imported inside the phases, after EV_BASE_DIR is set.
+
+
+# ---------------------------
+# Synthetic fixture
+# ---------------------------
+def synthetic_dataset(n_counties, n_months, seed):
+    """
+    Base columns for `n_counties` monthly series of cumulative EV counts.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end="2024-12-31", periods=n_months, freq="ME")
+
+    frames = []
+    for index in range(n_counties):
+        growth = rng.uniform(0.5, 5.0)
+        noise = rng.normal(0, growth, n_months)
+        values = np.maximum(np.cumsum(growth + noise) + rng.integers(10, 500), 0).round()
+
+        frames.append(pd.DataFrame({
+            "County": f"County{index:03d}",
+            "Date": dates,
+            "Electric Vehicle (EV) Total": values,
+            "months_since_start": np.arange(n_months),
+            "county_encoded": index,
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _train_prophet_standins(df, model_dir, n_counties):
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+
+    for county, county_df in list(df.groupby("County"))[:n_counties]:
+        prophet_df = county_df[["Date", "Electric Vehicle (EV) Total"]].rename(
+            columns={"Date": "ds", "Electric Vehicle (EV) Total": "y"}
+        )
+        model = Prophet(
+            yearly_seasonality=True,
+            weekly_seasonality=False,
+            daily_seasonality=False,
+            uncertainty_samples=100,
+        )
+        model.fit(prophet_df)
+
+        filename = f"{county}.json"
+        (model_dir / filename).write_text(model_to_json(model))
+        manifest[county] = {
+            "file": filename,
+            "rows": len(prophet_df),
+            "last_date": prophet_df["ds"].max().strftime("%Y-%m-%d"),
+            "data_hash": None,
+            "metrics": {},
+        }
+
+    with open(model_dir / "manifest.json", "w") as f:
+        json.dump({"format": "prophet-json", "counties": manifest}, f)
+
+
+def _train_lstm_standin(df, model_path, scaler_path, window, seed):
+    import joblib
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+
+    tf.keras.utils.set_random_seed(seed)
+
+    values = df["Electric Vehicle (EV) Total"].to_numpy().reshape(-1, 1)
+    scaler = MinMaxScaler().fit(values)
+    joblib.dump(scaler, scaler_path)
+
+    scaled = scaler.transform(values)[:, 0]
+    X = np.lib.stride_tricks.sliding_window_view(scaled[:-1], window)[:512, :, None]
+    y = scaled[window:][:512]
+
+    model = tf.keras.Sequential([
+        tf.keras.Input((window, 1)),
+        tf.keras.layers.LSTM(16),
+        tf.keras.layers.Dense(1),
+    ])
+    model.compile(optimizer="adam", loss="mse")
+    model.fit(X, y, epochs=1, batch_size=64, verbose=0)
+    model.save(model_path)
+
+
+def build_fixture(root, models, n_counties, n_months, prophet_counties, seed):
+    """
+    Write the synthetic dataset and stand-in models under `root` and
+    return {model: "ok" | "skipped: <reason>"}.
+    """
+    import joblib
+
+    os.environ["EV_BASE_DIR"] = str(root)
+
+    import training_modules  # noqa: F401
+    import data_io
+    from features import BASE_COLUMNS, FEATURE_WINDOW, build_features
+    from feature_config import FEATURE_COLUMNS, TARGET_COLUMN
+    from model_loader import LSTM_PATH, LSTM_SCALER_PATH, PROPHET_DIR, RF_PATH, XGB_PATH
+
+    (root / "data").mkdir(parents=True, exist_ok=True)
+    (root / "models").mkdir(parents=True, exist_ok=True)
+
+    df = build_features(synthetic_dataset(n_counties, n_months, seed)[BASE_COLUMNS])
+    df.to_csv(data_io.CSV_PATH, index=False)
+    try:
+        data_io.convert_csv_to_arrow()
+    except RuntimeError:
+        pass   # no pyarrow; the backend reads the CSV
+
+    train = df.dropna(subset=FEATURE_COLUMNS)
+    status = {}
+
+    for name in models:
+        try:
+            if name == "xgboost":
+                import xgboost as xgb
+                model = xgb.XGBRegressor(n_estimators=100, max_depth=6, random_state=seed)
+                joblib.dump(model.fit(train[FEATURE_COLUMNS], train[TARGET_COLUMN]), XGB_PATH)
+            elif name == "random_forest":
+                from sklearn.ensemble import RandomForestRegressor
+                model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=seed, n_jobs=-1)
+                joblib.dump(model.fit(train[FEATURE_COLUMNS], train[TARGET_COLUMN]), RF_PATH)
+            elif name == "prophet":
+                _train_prophet_standins(df, PROPHET_DIR, prophet_counties)
+            elif name == "lstm":
+                _train_lstm_standin(df, LSTM_PATH, LSTM_SCALER_PATH, FEATURE_WINDOW, seed)
+            status[name] = "ok"
+        except ImportError as e:
+            status[name] = f"skipped: {e}"
+
+    return status
+
+
+# ---------------------------
+# Phases
+# ---------------------------
+# Allowed |flattened - native| as a fraction of the largest prediction.
+# sklearn differs only by float32 leaf storage; XGBoost also sums its
+# leaves in float32, in its own order.
+PARITY_RTOL = {"random_forest": 1e-6, "xgboost": 1e-5}
+
+
+def _parity_models(X, Y, seed):
+    """
+    (case, kind, fitted model, feature matrix to compare on) for every
+    model shape serving flattens.
+    """
+    import xgboost as xgb
+    from sklearn.ensemble import RandomForestRegressor
+
+    y = Y[:, 0]
+    rng = np.random.default_rng(seed)
+    X_nan = X.copy()
+    X_nan[rng.random(X.shape) < 0.1] = np.nan
+
+    def forest(targets):
+        return RandomForestRegressor(n_estimators=50, max_depth=12, random_state=seed, n_jobs=-1).fit(X, targets)
+
+    def booster(targets, **params):
+        return xgb.XGBRegressor(n_estimators=100, max_depth=6, random_state=seed, **params).fit(X, targets)
+
+    yield "random_forest", "random_forest", forest(y), X
+    yield "random_forest nan", "random_forest", forest(y), X_nan
+    yield "random_forest multi", "random_forest", forest(Y), X
+    yield "xgboost", "xgboost", booster(y), X
+    yield "xgboost nan", "xgboost", booster(y), X_nan
+    yield "xgboost multi", "xgboost", booster(Y), X
+    yield "xgboost quantile", "xgboost", booster(
+        y, objective="reg:quantileerror", quantile_alpha=[0.1, 0.9]
+    ), X
+
+
+def _feature_parity(df):
+    """
+    Step a FeatureBuffer through every county on the observed values
+    and compare each fill() with the build_features() row (training's
+    window_features over lag_windows) for the same month.
+    """
+    from feature_builder import FeatureBuffer
+    from feature_config import DATE_COLUMN, FEATURE_COLUMNS, TARGET_COLUMN
+    from features import FEATURE_WINDOW, build_features
+
+    frame = build_features(df)
+    counties = [group for _, group in frame.groupby("County", sort=True)]
+    if len({len(group) for group in counties}) != 1:
+        raise ValueError("feature parity needs equal-length county series")
+
+    values = np.stack([group[TARGET_COLUMN].to_numpy(dtype=np.float64) for group in counties])
+    expected = np.stack([group[FEATURE_COLUMNS].to_numpy(dtype=np.float64) for group in counties])
+    seed_row = [group.iloc[FEATURE_WINDOW - 1] for group in counties]
+
+    state = FeatureBuffer(
+        historical_values=values[:, :FEATURE_WINDOW],
+        county_encoded=[row["county_encoded"] for row in seed_row],
+        months_since_start=[row["months_since_start"] for row in seed_row],
+        last_year=[row[DATE_COLUMN].year for row in seed_row],
+        last_month=[row[DATE_COLUMN].month for row in seed_row],
+    )
+
+    diff = 0.0
+    scale = 1.0
+    for t in range(FEATURE_WINDOW, values.shape[1]):
+        actual = state.fill(t - FEATURE_WINDOW + 1).astype(np.float64)
+        diff = max(diff, float(np.abs(actual - expected[:, t]).max()))
+        scale = max(scale, float(np.abs(expected[:, t]).max()))
+        state.push(values[:, t])
+
+    # The feature matrix is float32
+    tolerance = 1e-6 * scale
+    return {
+        "case": "feature_buffer",
+        "rows": int(values.shape[0] * (values.shape[1] - FEATURE_WINDOW)),
+        "max_abs_diff": diff,
+        "tolerance": tolerance,
+        "ok": diff <= tolerance,
+    }
+
+
+def bench_parity(seed):
+    """
+    Fit small models of every shape on the fixture data and compare the
+    NumPy evaluator with the libraries' own predict; then check the
+    FeatureBuffer against the training features.
+    """
+    import training_modules  # noqa: F401
+    from data_io import load_dataset
+    from feature_config import FEATURE_COLUMNS
+    from features import build_direct_targets
+    from tree_ensemble import TreeEnsemble, flatten_model
+
+    df = load_dataset()
+    targets = build_direct_targets(df, 3)
+    rows = df.join(targets).dropna(subset=FEATURE_COLUMNS + list(targets.columns))
+    X = rows[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    Y = rows[list(targets.columns)].to_numpy(dtype=np.float64)
+
+    results = []
+    for case, kind, model, features in _parity_models(X, Y, seed):
+        expected = np.asarray(model.predict(features), dtype=np.float64)
+        actual = TreeEnsemble(*flatten_model(model)).predict(features)
+
+        diff = float(np.abs(actual - expected).max())
+        tolerance = PARITY_RTOL[kind] * max(1.0, float(np.abs(expected).max()))
+        results.append({
+            "case": case,
+            "rows": len(features),
+            "max_abs_diff": diff,
+            "tolerance": tolerance,
+            "ok": bool(actual.shape == expected.shape and diff <= tolerance),
+        })
+        print(f"  parity {case:<20} max|diff|={diff:.2e} (tol {tolerance:.1e}) {'ok' if results[-1]['ok'] else 'FAIL'}")
+
+    results.append(_feature_parity(df))
+    result = results[-1]
+    print(
+        f"  parity {result['case']:<20} max|diff|={result['max_abs_diff']:.2e} "
+        f"(tol {result['tolerance']:.1e}) {'ok' if result['ok'] else 'FAIL'}"
+    )
+
+    return results
+
+
+def _summary_ms(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {
+        "n": int(ms.size),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def bench_latency(models, horizons, repeat, seed):
+    from county_store import load_county_store
+    from forecasting import forecast_ev_demand
+    from model_loader import load_prophet_manifest
+
+    store = load_county_store()
+    rng = random.Random(seed)
+    results = []
+
+    for name in models:
+        counties = store.counties
+        if name == "prophet":
+            prophet_counties = {entry["county"] for entry in load_prophet_manifest().values()}
+            counties = [c for c in counties if c in prophet_counties]
+
+        # First call pays model loading; measured separately
+        start = time.perf_counter()
+        forecast_ev_demand(store, counties[0], name, horizons[0])
+        first_call = time.perf_counter() - start
+
+        for horizon in horizons:
+            timings = []
+            for _ in range(repeat):
+                county = rng.choice(counties)
+                start = time.perf_counter()
+                forecast_ev_demand(store, county, name, horizon)
+                timings.append(time.perf_counter() - start)
+
+            results.append({
+                "model": name,
+                "horizon": horizon,
+                "first_call_ms": first_call * 1000,
+                **_summary_ms(timings),
+            })
+            print(f"  latency {name:<14} h={horizon:<4} p50={results[-1]['p50_ms']:.2f}ms")
+
+    return results
+
+
+async def _drive(client, payloads, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+    statuses = {}
+
+    async def one(payload):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/forecast", json=payload)
+            timings.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    return time.perf_counter() - start, timings, statuses
+
+
+def bench_throughput(models, requests, concurrency, seed):
+    import httpx
+
+    os.environ["EV_FORECAST_MODE"] = "live"
+    import main
+    from model_loader import load_prophet_manifest
+
+    rng = random.Random(seed)
+    counties = main.store.counties
+    results = []
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in models:
+                pool = counties
+                if name == "prophet":
+                    pool = [entry["county"] for entry in load_prophet_manifest().values()]
+
+                payloads = [
+                    {"county": rng.choice(pool), "model_name": name, "horizon": rng.choice(HORIZONS)}
+                    for _ in range(requests)
+                ]
+
+                # Load the model outside the measurement
+                await client.post("/forecast", json=payloads[0])
+
+                for cache in ("on", "off"):
+                    main.forecast_cache.clear()
+                    main.forecast_cache.max_entries = 512 if cache == "on" else 0
+
+                    elapsed, timings, statuses = await _drive(client, payloads, concurrency)
+                    results.append({
+                        "model": name,
+                        "cache": cache,
+                        "requests": requests,
+                        "concurrency": concurrency,
+                        "rps": requests / elapsed,
+                        "statuses": {str(code): n for code, n in statuses.items()},
+                        **_summary_ms(timings),
+                    })
+                    print(f"  throughput {name:<14} cache={cache:<3} {results[-1]['rps']:.0f} req/s")
+
+    asyncio.run(run())
+    main.inference_pool.shutdown()
+    return results
+
+
+def _run_python(code, env):
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Peak RSS in KiB. VmHWM belongs to the current address space; ru_maxrss
+# (the fallback off Linux) can include the parent's peak from before exec.
+PEAK_RSS_SNIPPET = (
+    "def peak_rss():\n"
+    "    try:\n"
+    "        with open('/proc/self/status') as f:\n"
+    "            for line in f:\n"
+    "                if line.startswith('VmHWM:'):\n"
+    "                    return int(line.split()[1])\n"
+    "    except OSError:\n"
+    "        pass\n"
+    "    import resource\n"
+    "    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+)
+
+
+def bench_startup(repeat):
+    """
+    Fresh-interpreter `import main`, per serving mode. Shared mode is
+    primed once first, as `python shared_arrays.py` would before the
+    workers start.
+    """
+    code = PEAK_RSS_SNIPPET + (
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "print(json.dumps([time.perf_counter() - start, peak_rss()]))\n"
+    )
+
+    results = {}
+    for mode, extra in (("default", {}), ("shared", {"EV_SHARED_MODE": "1"})):
+        env = {**os.environ, "EV_WARMUP_MODELS": "", **extra}
+        if mode == "shared":
+            _run_python(code, env)
+
+        import_seconds = []
+        process_seconds = []
+        peak_kib = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            seconds, peak = _run_python(code, env)
+            process_seconds.append(time.perf_counter() - start)
+            import_seconds.append(seconds)
+            peak_kib.append(peak)
+
+        results[mode] = {
+            "import_main": _summary_ms(import_seconds),
+            "process": _summary_ms(process_seconds),
+            "peak_rss_mb": float(np.median(peak_kib)) / 1024,
+        }
+        print(
+            f"  startup {mode:<8} import main p50={results[mode]['import_main']['p50_ms']:.0f}ms "
+            f"peak={results[mode]['peak_rss_mb']:.0f}MB"
+        )
+
+    return results
+
+
+def bench_memory(models):
+    env = dict(os.environ)
+    results = []
+
+    for name in models:
+        code = PEAK_RSS_SNIPPET + (
+            "import json\n"
+            "import model_loader\n"
+            "before = peak_rss()\n"
+            f"model_loader.warm_up([{name!r}])\n"
+            "after = peak_rss()\n"
+            f"print(json.dumps([before, after, model_loader.model_load_status()[{name!r}]]))\n"
+        )
+        # The first load of a tree model flattens it into its shared
+        # bundle; measure the steady-state load after that
+        if name in ("xgboost", "random_forest"):
+            _run_python(code, env)
+        before, after, status = _run_python(code, env)
+
+        results.append({
+            "model": name,
+            "baseline_rss_mb": before / 1024,
+            "peak_rss_mb": after / 1024,
+            "model_rss_mb": (after - before) / 1024,
+            "load_seconds": status["seconds"],
+            "state": status["state"],
+        })
+        print(f"  memory {name:<14} peak={results[-1]['peak_rss_mb']:.0f}MB (+{results[-1]['model_rss_mb']:.0f}MB)")
+
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency / throughput / startup / memory benchmarks")
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--counties", type=int, default=40)
+    parser.add_argument("--months", type=int, default=96)
+    parser.add_argument("--prophet-counties", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--startup-repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="small counts for a smoke run")
+    parser.add_argument("--out", default=None, help="JSON results path (default: stdout)")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.counties, args.prophet_counties = 8, 3
+        args.repeat, args.requests, args.startup_repeat = 5, 40, 1
+
+    requested = [name.strip() for name in args.models.split(",") if name.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="ev-bench-") as root:
+        print(f"fixture: {args.counties} counties x {args.months} months in {root}")
+        fixture = build_fixture(
+            Path(root), requested, args.counties, args.months, args.prophet_counties, args.seed
+        )
+        models = [name for name in requested if fixture[name] == "ok"]
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "params": vars(args),
+                "fixture": fixture,
+            },
+            "latency": bench_latency(models, HORIZONS, args.repeat, args.seed),
+            "throughput": bench_throughput(models, args.requests, args.concurrency, args.seed),
+            "startup": bench_startup(args.startup_repeat),
+            "memory": bench_memory(models),
+            "parity": bench_parity(args.seed),
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text)
+        print(f"\n✅ Results written to {args.out}")
+    else:
+        print(text)
+
+    if not all(result["ok"] for result in report["parity"]):
+        raise SystemExit("❌ TreeEnsemble predictions differ from the native models")
+
+
+if __name__ == "__main__":
+    main()
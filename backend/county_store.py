@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+import training_modules  # noqa: F401
+from data_io import dataset_path, load_dataset
+from shared_arrays import bundle_path, open_or_publish
+
+TARGET_COLUMN = "Electric Vehicle (EV) Total"
+
+# The only columns serving reads from the dataset
+STORE_COLUMNS = ["County", "Date", TARGET_COLUMN, "months_since_start", "county_encoded"]
+
+SHARED_BUNDLE = "county_store"
+
+
+class CountySeries:
+    """
+    Read-only, date-sorted column arrays for one county.
+    """
+
+    __slots__ = ("name", "dates", "values", "months_since_start", "county_encoded")
+
+    def __init__(self, name, dates, values, months_since_start, county_encoded):
+        self.name = name
+        self.dates = dates
+        self.values = values
+        self.months_since_start = months_since_start
+        self.county_encoded = county_encoded
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CountyStore:
+    """
+    County-keyed index over the preprocessed dataset.
+
+    Rows are sorted once by (county, date) into contiguous column arrays
+    and every county is a slice view into them, reached through a
+    case-folded lookup map. Retrieval is a dict hit with no copying.
+    The column arrays can come from a DataFrame or, in shared mode, be
+    memory-mapped from a bundle every worker attaches to.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        frame = df.dropna(subset=["County"])
+        frame = (
+            frame.assign(_key=frame["County"].str.lower())
+            .sort_values(["_key", "Date"], kind="stable")
+            .reset_index(drop=True)
+        )
+
+        keys = frame["_key"].to_numpy()
+        names = frame["County"].to_numpy()
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+
+        arrays = {
+            "dates": frame["Date"].to_numpy(dtype="datetime64[ns]"),
+            "values": frame[TARGET_COLUMN].to_numpy(dtype=np.float64),
+            "months_since_start": frame["months_since_start"].to_numpy(dtype=np.float64),
+            "starts": starts,
+            "ends": ends,
+            "county_encoded": frame["county_encoded"].to_numpy()[starts].astype(np.int64),
+        }
+
+        for array in arrays.values():
+            array.flags.writeable = False
+
+        self._attach(arrays, {"names": names[starts].tolist()})
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """
+        Build a store over existing column arrays (e.g. memory-mapped).
+        """
+        store = cls.__new__(cls)
+        store._attach(arrays, meta)
+        return store
+
+    def _attach(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+
+        dates = arrays["dates"]
+        values = arrays["values"]
+        months_since_start = arrays["months_since_start"]
+
+        self._series = {}
+        for name, start, end, encoded in zip(
+            meta["names"],
+            arrays["starts"].tolist(),
+            arrays["ends"].tolist(),
+            arrays["county_encoded"].tolist(),
+        ):
+            self._series[name.lower()] = CountySeries(
+                name=name,
+                dates=dates[start:end],
+                values=values[start:end],
+                months_since_start=months_since_start[start:end],
+                county_encoded=int(encoded),
+            )
+
+        self.counties = sorted(series.name for series in self._series.values())
+
+    def get(self, county: str) -> CountySeries:
+        series = self._series.get(county.lower())
+
+        if series is None:
+            raise ValueError(f"No data found for county: {county}")
+
+        return series
+
+    def __contains__(self, county):
+        return county.lower() in self._series
+
+    def __len__(self):
+        return len(self._series)
+
+
+def shared_county_store_path():
+    return bundle_path(SHARED_BUNDLE, [dataset_path()])
+
+
+def load_county_store(shared=False):
+    """
+    Build a CountyStore from just the columns it needs (memory-mapped
+    when the Arrow copy of the dataset exists).
+
+    With shared=True the column arrays are memory-mapped from a bundle
+    keyed on the dataset file, published by the first worker (or by
+    `python shared_arrays.py`) and attached read-only by the rest.
+    """
+    if not shared:
+        return CountyStore(load_dataset(STORE_COLUMNS))
+
+    def build():
+        store = CountyStore(load_dataset(STORE_COLUMNS))
+        return store.arrays, store.meta
+
+    return CountyStore.from_arrays(
+        *open_or_publish(SHARED_BUNDLE, [dataset_path()], build)
+    )
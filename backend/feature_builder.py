@@ -1,48 +1,116 @@
 import numpy as np
-import pandas as pd
 
+import training_modules  # noqa: F401
+from feature_config import FEATURE_COLUMNS
+from features import growth_slope_weights, lag_features
 
-def build_feature_row(
-    historical_values,
-    cumulative_values,
-    county_encoded,
-    months_since_start,
-    year,
-    month,
-):
+(
+    COL_MONTHS_SINCE_START,
+    COL_YEAR,
+    COL_MONTH,
+    COL_COUNTY_ENCODED,
+    COL_LAG1,
+    COL_LAG2,
+    COL_LAG3,
+    COL_ROLL_MEAN_3,
+    COL_PCT_CHANGE_1,
+    COL_PCT_CHANGE_3,
+    COL_GROWTH_SLOPE,
+) = range(len(FEATURE_COLUMNS))
+
+
+class FeatureBuffer:
     """
-    Build a single-row feature DataFrame matching training-time features.
+    Recursive feature state for one or more series stepped in lockstep.
+
+    The incremental form of training/features.window_features: fill()
+    computes the same columns from the current windows (the lag columns
+    with the same lag_features, the slope with the same weights), push()
+    slides them forward by one predicted month.
+
+    Lag and cumulative windows are kept in preallocated ring buffers and
+    every step writes into the same (N, 11) float32 feature matrix, so
+    there is no per-step DataFrame construction or polyfit call.
     """
 
-    lag1, lag2, lag3 = (
-        historical_values[-1],
-        historical_values[-2],
-        historical_values[-3],
-    )
-
-    roll_mean_3 = np.mean([lag1, lag2, lag3])
-
-    pct_change_1 = (lag1 - lag2) / lag2 if lag2 != 0 else 0
-    pct_change_3 = (lag1 - lag3) / lag3 if lag3 != 0 else 0
-
-    ev_growth_slope = (
-        np.polyfit(range(len(cumulative_values)), cumulative_values, 1)[0]
-        if len(cumulative_values) >= 3
-        else 0
-    )
-
-    return pd.DataFrame([{
-        "months_since_start": months_since_start,
-        "year": year,
-        "month": month,
-        "county_encoded": county_encoded,
-        "ev_total_lag1": lag1,
-        "ev_total_lag2": lag2,
-        "ev_total_lag3": lag3,
-        "ev_total_roll_mean_3": roll_mean_3,
-        "ev_total_pct_change_1": pct_change_1,
-        "ev_total_pct_change_3": pct_change_3,
-        "ev_growth_slope": ev_growth_slope,
-    }])
-
-    return feature_row
+    def __init__(
+        self,
+        historical_values,
+        county_encoded,
+        months_since_start,
+        last_year,
+        last_month,
+    ):
+        values = np.array(historical_values, dtype=np.float64, ndmin=2)
+        n_rows, window = values.shape
+
+        if window < 3:
+            raise ValueError("At least 3 historical values are required")
+
+        self.window = window
+        self.n_rows = n_rows
+
+        # Ring buffers; logical position i (0 = oldest) lives at (pos + i) % window
+        self._values = np.ascontiguousarray(values)
+        self._cumulative = np.cumsum(values, axis=1)
+        self._pos = 0
+
+        weights = growth_slope_weights(window)
+        self._slope_weights = np.stack(
+            [np.roll(weights, p) for p in range(window)]
+        )
+
+        self._months_since_start = np.asarray(months_since_start, dtype=np.float64)
+        self._month_index = (
+            np.asarray(last_year, dtype=np.float64) * 12
+            + np.asarray(last_month, dtype=np.float64)
+            - 1
+        )
+
+        self._tmp = np.empty(n_rows, dtype=np.float64)
+
+        self.features = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float32)
+        self.features[:, COL_COUNTY_ENCODED] = county_encoded
+
+    def fill(self, step):
+        """
+        Write the features for `step` months past the last observation
+        into self.features and return it.
+        """
+        X = self.features
+        tmp = self._tmp
+        pos = self._pos
+        window = self.window
+
+        np.add(self._months_since_start, step, out=X[:, COL_MONTHS_SINCE_START])
+
+        np.add(self._month_index, step, out=tmp)
+        np.floor_divide(tmp, 12, out=X[:, COL_YEAR])
+        np.remainder(tmp, 12, out=tmp)
+        np.add(tmp, 1, out=X[:, COL_MONTH])
+
+        X[:, COL_LAG1:COL_PCT_CHANGE_3 + 1] = lag_features(
+            self._values[:, (pos - 1) % window],
+            self._values[:, (pos - 2) % window],
+            self._values[:, (pos - 3) % window],
+        )
+
+        np.dot(self._cumulative, self._slope_weights[pos], out=tmp)
+        X[:, COL_GROWTH_SLOPE] = tmp
+
+        return X
+
+    def push(self, predictions):
+        """
+        Roll the windows forward with one prediction per series.
+        """
+        pos = self._pos
+        newest = (pos - 1) % self.window
+
+        np.add(
+            self._cumulative[:, newest],
+            predictions,
+            out=self._cumulative[:, pos],
+        )
+        self._values[:, pos] = predictions
+        self._pos = (pos + 1) % self.window
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from model_loader import INTERVAL_ARTIFACTS, MODEL_ARTIFACTS
+
+# Result arrays indexed by forecast month
+FORECAST_KEYS = ("forecast", "lower", "upper")
+
+
+def artifact_fingerprint(paths):
+    """
+    Cheap version stamp for a set of files: (name, size, mtime) per path.
+    A retrained model or refreshed dataset changes the stamp.
+    """
+    stamp = []
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+            stamp.append((str(path), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stamp.append((str(path), None, None))
+    return tuple(stamp)
+
+
+def slice_forecast(result, county, horizon):
+    """
+    Trim a cached forecast to its first `horizon` months.
+
+    Recursive, Prophet and LSTM forecasts do not depend on the requested
+    horizon for earlier months, so a longer forecast answers any shorter one.
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1")
+
+    meta = result["meta"]
+
+    sliced = {
+        "meta": {**meta, "county": county, "horizon": horizon},
+        "dates": result["dates"][:meta["history_points"] + horizon],
+        "historical": result["historical"],
+    }
+
+    for key in FORECAST_KEYS:
+        if key in result:
+            sliced[key] = result[key][:horizon]
+
+    return sliced
+
+
+class ForecastCache:
+    """
+    Bounded LRU cache of forecast_ev_demand results.
+
+    Entries are keyed on (county, model, variant) plus a fingerprint of
+    the dataset file and the model's artifacts, and keep the longest
+    horizon computed so far. `variant` separates results computed with
+    different request options (e.g. with prediction intervals). An
+    optional TTL (seconds) expires entries regardless of use.
+    """
+
+    def __init__(self, data_path, max_entries=512, ttl_seconds=None):
+        self.data_path = Path(data_path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _key(self, county, model_name, variant):
+        paths = [self.data_path] + MODEL_ARTIFACTS.get(model_name, [])
+        if variant == "intervals":
+            paths += INTERVAL_ARTIFACTS.get(model_name, [])
+        return county.lower(), model_name, variant, artifact_fingerprint(paths)
+
+    def get(self, county, model_name, horizon, variant=None):
+        """
+        Return the cached forecast covering `horizon`, or None.
+        """
+        key = self._key(county, model_name, variant)
+
+        with self._lock:
+            # Never a hit: no forecast covers a horizon below one month
+            entry = self._entries.get(key) if horizon >= 1 else None
+
+            if entry is not None and self.ttl_seconds is not None:
+                if time.monotonic() - entry["created"] > self.ttl_seconds:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+
+            if entry is None or entry["horizon"] < horizon:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry["horizon"] > horizon:
+                self.prefix_hits += 1
+
+        return slice_forecast(entry["result"], county, horizon)
+
+    def put(self, county, model_name, horizon, result, variant=None):
+        key = self._key(county, model_name, variant)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            # Never replace a longer forecast with a shorter one
+            if entry is not None and entry["horizon"] >= horizon:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = {
+                "horizon": horizon,
+                "result": result,
+                "created": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "prefix_hits": self.prefix_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,173 +1,548 @@
+import time
+import warnings
+
 import pandas as pd
 import numpy as np
 
 from model_loader import (
-    load_xgboost,
-    load_random_forest,
-    load_prophet_models,
+    TREE_MODEL_PATHS,
+    load_tree_ensemble,
+    load_prophet,
     load_lstm,
+    load_lstm_step,
 )
 
-from feature_builder import build_feature_row
+from county_store import CountyStore
+from feature_builder import FeatureBuffer
+from features import FEATURE_WINDOW
+from telemetry import FORECAST_STAGE_SECONDS, stage
+
+TREE_MODELS = ["xgboost", "random_forest"]
+# Multi-output trees predicting the whole horizon from the last observed
+# state (train_*.py --direct H); no recursion
+DIRECT_MODELS = ["xgboost_direct", "random_forest_direct"]
+# Models forecast_many runs across counties in one batch
+BATCHED_MODELS = TREE_MODELS + DIRECT_MODELS + ["lstm"]
+# Models that can add lower/upper bands (intervals=True)
+INTERVAL_MODELS = TREE_MODELS + ["prophet"]
+# Every model_name forecast_ev_demand accepts
+FORECAST_MODELS = TREE_MODELS + DIRECT_MODELS + ["prophet", "lstm"]
+HISTORY_WINDOW = 24
+# Longest horizon (months) the API accepts and materialize.py precomputes
+MAX_HORIZON = 120
+# year * 12 + month - 1 of datetime64's epoch month
+EPOCH_MONTH = 1970 * 12
+RECURSION_WINDOW = FEATURE_WINDOW
+
+# RandomForest intervals: central coverage of the sampled paths at each
+# month (Prophet's default width; the XGBoost quantile model is trained
+# for the same 0.1 / 0.9) and the number of paths
+INTERVAL_WIDTH = 0.8
+INTERVAL_PATHS = 200
+
+# Tree models are fed raw float32 arrays; sklearn would otherwise warn
+# on every call that the training-time column names are missing.
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+
+def month_labels(start_month, count):
+    """
+    Return `count` consecutive "YYYY-MM" labels starting at
+    start_month (year * 12 + month - 1).
+    """
+    months = np.arange(start_month, start_month + count) - EPOCH_MONTH
+    return np.datetime_as_string(months.astype("datetime64[M]"), unit="M").tolist()
 
 
-def forecast_ev_demand(
-    df: pd.DataFrame,
-    county: str,
-    model_name: str,
-    horizon: int = 36,
-):
+def future_month_labels(last_date, horizon):
     """
-    Forecast EV demand for a given county and model.
+    Return "YYYY-MM" labels for the `horizon` months after last_date.
+    """
+    return month_labels(last_date.year * 12 + last_date.month, horizon)
+
+
+def check_model_name(model_name):
+    if model_name not in FORECAST_MODELS:
+        raise ValueError("Invalid model name")
+
 
-    Returns a combined historical + forecast time series
-    suitable for frontend line charts.
+def county_context(series):
     """
+    Derive the history series and recursive-forecast seed for one county.
+    """
+    dates = series.dates[-HISTORY_WINDOW:]
+    values = series.values[-HISTORY_WINDOW:]
 
-    # -------------------------------------------------
-    # Normalize + filter county (CASE SAFE)
-    # -------------------------------------------------
-    county_df = (
-        df[df["County"].str.lower() == county.lower()]
-        .sort_values("Date")
-        .reset_index(drop=True)
-    )
+    return {
+        "history_dates": np.datetime_as_string(dates, unit="M").tolist(),
+        "history_values": values.astype(int).tolist(),
+        "last_date": pd.Timestamp(dates[-1]),
+        "months_since_start": int(series.months_since_start.max()),
+        "county_encoded": series.county_encoded,
+        # Rolling window for recursive forecasting
+        "historical_values": values[-RECURSION_WINDOW:].tolist(),
+    }
 
-    if county_df.empty:
-        raise ValueError(f"No data found for county: {county}")
 
-    model_name = model_name.lower()
+def _group_by_window(contexts):
+    """
+    Group context indices by recursion window length; each group can be
+    stepped as one batch.
+    """
+    groups = {}
+    for index, context in enumerate(contexts):
+        groups.setdefault(len(context["historical_values"]), []).append(index)
+    return groups.values()
 
-    # -------------------------------------------------
-    # HISTORICAL SERIES (last 24 months)
-    # -------------------------------------------------
-    history_window = 24
-    historical_df = county_df.tail(history_window)
-
-    historical_series = [
-        {
-            "date": row["Date"].strftime("%Y-%m"),
-            "historical": int(row["Electric Vehicle (EV) Total"]),
-            "forecast": None,
-        }
-        for _, row in historical_df.iterrows()
-    ]
 
-    # -------------------------------------------------
-    # SHARED CONTEXT
-    # -------------------------------------------------
-    last_date = pd.to_datetime(historical_df["Date"].max())
-    months_since_start = int(county_df["months_since_start"].max())
-    county_encoded = int(county_df["county_encoded"].iloc[0])
+def forecast_columns(context, values):
+    return {
+        "dates": future_month_labels(context["last_date"], len(values)),
+        "forecast": values,
+    }
 
-    # Rolling windows for recursive forecasting
-    historical_values = list(
-        historical_df["Electric Vehicle (EV) Total"].values[-6:]
-    )
-    cumulative_values = list(np.cumsum(historical_values))
 
-    forecast_series = []
+def _tree_forecast(model, contexts, horizon, model_name):
+    """
+    Run the recursive tree-model forecast for all contexts in lockstep.
 
-    # -------------------------------------------------
-    # XGBOOST / RANDOM FOREST
-    # -------------------------------------------------
-    if model_name in ["xgboost", "random_forest"]:
-        model = (
-            load_xgboost()
-            if model_name == "xgboost"
-            else load_random_forest()
+    Counties sharing a window length are stacked into one FeatureBuffer,
+    so each horizon step is a single predict over an N-row matrix.
+    Returns one forecast series per context, in order.
+    """
+    series = [None] * len(contexts)
+
+    for indices in _group_by_window(contexts):
+        group = [contexts[i] for i in indices]
+
+        state = FeatureBuffer(
+            historical_values=[c["historical_values"] for c in group],
+            county_encoded=[c["county_encoded"] for c in group],
+            months_since_start=[c["months_since_start"] for c in group],
+            last_year=[c["last_date"].year for c in group],
+            last_month=[c["last_date"].month for c in group],
         )
 
+        preds = np.empty((len(group), horizon))
+        timings = np.empty((3, horizon))
+
         for step in range(1, horizon + 1):
-            future_date = last_date + pd.DateOffset(months=step)
-
-            features = build_feature_row(
-                historical_values=historical_values,
-                cumulative_values=cumulative_values,
-                county_encoded=county_encoded,
-                months_since_start=months_since_start + step,
-                year=future_date.year,
-                month=future_date.month,
-            )
-
-            pred = model.predict(features)[0]
-            pred = max(0, int(round(pred)))
-
-            forecast_series.append({
-                "date": future_date.strftime("%Y-%m"),
-                "historical": None,
-                "forecast": pred,
-            })
+            timings[0, step - 1] = time.perf_counter()
+            X = state.fill(step)
+            timings[1, step - 1] = time.perf_counter()
+            pred = np.maximum(np.rint(model.predict(X)), 0)
+            timings[2, step - 1] = time.perf_counter()
+            preds[:, step - 1] = pred
 
             # Update rolling windows
-            historical_values.append(pred)
-            historical_values.pop(0)
+            state.push(pred)
 
-            cumulative_values.append(cumulative_values[-1] + pred)
-            cumulative_values.pop(0)
+        # Per-step timings are recorded in bulk, outside the loop
+        FORECAST_STAGE_SECONDS.observe_many(
+            timings[1] - timings[0], model=model_name, stage="feature_build"
+        )
+        FORECAST_STAGE_SECONDS.observe_many(
+            timings[2] - timings[1], model=model_name, stage="predict"
+        )
 
-    # -------------------------------------------------
-    # PROPHET (PER-COUNTY MODELS)
-    # -------------------------------------------------
-    elif model_name == "prophet":
-        prophet_models = load_prophet_models()
+        for index, values in zip(indices, preds.astype(int).tolist()):
+            series[index] = forecast_columns(contexts[index], values)
+
+    return series
+
+
+def _interval_state(context, rows):
+    """
+    FeatureBuffer with `rows` copies of one context's recursion seed.
+    """
+    return FeatureBuffer(
+        historical_values=np.tile(context["historical_values"], (rows, 1)),
+        county_encoded=context["county_encoded"],
+        months_since_start=context["months_since_start"],
+        last_year=context["last_date"].year,
+        last_month=context["last_date"].month,
+    )
+
+
+def _interval_columns(context, point, lower, upper):
+    """
+    Forecast columns with bands widened where needed to contain the
+    point forecast.
+    """
+    forecast = forecast_columns(context, point.astype(int).tolist())
+    forecast["lower"] = np.minimum(lower, point).astype(int).tolist()
+    forecast["upper"] = np.maximum(upper, point).astype(int).tolist()
+    return forecast
+
+
+def _forest_intervals(model, context, horizon, seed=0):
+    """
+    RandomForest point forecast plus bands from sampled paths.
+
+    Row 0 is the point recursion (all trees, averaged). Each of the
+    INTERVAL_PATHS other rows draws one tree per month and feeds that
+    tree's prediction back, so tree disagreement compounds through the
+    recursion; the bands are percentiles of those paths. Every month is
+    one evaluator pass for the point row plus one for the sampled
+    trees, never a loop over the trees.
+    """
+    rng = np.random.default_rng(seed)
+    state = _interval_state(context, 1 + INTERVAL_PATHS)
+    values = np.empty((1 + INTERVAL_PATHS, horizon))
+
+    for step in range(1, horizon + 1):
+        X = state.fill(step)
+        with stage("random_forest", "predict_intervals"):
+            point = model.predict(X[:1])
+            drawn = rng.integers(len(model), size=(INTERVAL_PATHS, 1))
+            sampled = model.tree_values(X[1:], drawn)[:, 0, 0]
+
+        values[0, step - 1] = point[0]
+        values[1:, step - 1] = sampled
+        values[:, step - 1] = np.maximum(np.rint(values[:, step - 1]), 0)
+        state.push(values[:, step - 1])
+
+    tail = (1 - INTERVAL_WIDTH) / 2 * 100
+    lower, upper = np.percentile(values[1:], [tail, 100 - tail], axis=0)
+
+    return _interval_columns(context, values[0], np.rint(lower), np.rint(upper))
+
+
+def _quantile_intervals(model, quantile_model, context, horizon):
+    """
+    XGBoost point forecast plus bands from the quantile model trained
+    alongside it, both evaluated on the point recursion's features.
+
+    Each month's lower/upper are the model's lowest/highest quantile for
+    that month given the point path so far: a central one-step-ahead
+    band around the point forecast. Unlike the RandomForest paths, the
+    uncertainty of earlier months does not compound into later bands.
+    """
+    if not quantile_model.quantiles or len(quantile_model.quantiles) < 2:
+        raise ValueError("XGBoost quantile model has no lower/upper quantiles")
+
+    low = int(np.argmin(quantile_model.quantiles))
+    high = int(np.argmax(quantile_model.quantiles))
+
+    state = _interval_state(context, 1)
+    values = np.empty((3, horizon))
+
+    for step in range(1, horizon + 1):
+        X = state.fill(step)
+        with stage("xgboost", "predict_intervals"):
+            point = model.predict(X)
+            bounds = quantile_model.predict(X)
+
+        values[:, step - 1] = np.maximum(
+            np.rint([point[0], bounds[0, low], bounds[0, high]]), 0
+        )
+        state.push(values[:1, step - 1])
+
+    return _interval_columns(context, values[0], values[1], values[2])
+
+
+def _tree_intervals(model_name, model, context, horizon):
+    if model_name == "random_forest":
+        return _forest_intervals(model, context, horizon)
+
+    if not TREE_MODEL_PATHS["xgboost_quantiles"].exists():
+        raise ValueError("XGBoost intervals need the quantile model from train_xgboost.py")
+    return _quantile_intervals(model, load_tree_ensemble("xgboost_quantiles"), context, horizon)
+
+
+def _check_direct_horizon(model, horizon, model_name):
+    if horizon > model.n_outputs:
+        raise ValueError(f"{model_name} forecasts at most {model.n_outputs} months")
+
+
+def check_horizon(model_name, horizon):
+    """
+    Raise ValueError if `model_name` cannot forecast `horizon` months
+    (direct models stop at the horizon they were trained for). Callers
+    batching requests check each one first, so it cannot fail the rest.
+    """
+    if model_name in DIRECT_MODELS:
+        _check_direct_horizon(load_tree_ensemble(model_name), horizon, model_name)
+
+
+def _direct_forecast(model, contexts, horizon, model_name):
+    """
+    Forecast every context's horizon with one predict call.
+
+    The features are those of the first future month, i.e. the last
+    observed state the recursive models start from; output h-1 of the
+    model is month h. Returns one forecast series per context, in order.
+    """
+    _check_direct_horizon(model, horizon, model_name)
+
+    series = [None] * len(contexts)
+
+    for indices in _group_by_window(contexts):
+        group = [contexts[i] for i in indices]
+
+        with stage(model_name, "feature_build"):
+            X = FeatureBuffer(
+                historical_values=[c["historical_values"] for c in group],
+                county_encoded=[c["county_encoded"] for c in group],
+                months_since_start=[c["months_since_start"] for c in group],
+                last_year=[c["last_date"].year for c in group],
+                last_month=[c["last_date"].month for c in group],
+            ).fill(1)
+
+        with stage(model_name, "predict"):
+            preds = model.predict(X).reshape(len(group), -1)[:, :horizon]
+
+        preds = np.maximum(np.rint(preds), 0).astype(int)
+
+        for index, values in zip(indices, preds.tolist()):
+            series[index] = forecast_columns(contexts[index], values)
+
+    return series
+
+
+def _lstm_forecast(step_fn, scaler, contexts, horizon):
+    """
+    Roll every context's scaled sequence forward together.
+
+    Each step is one compiled call on an (N, window, 1) tensor; outputs
+    are written into a preallocated buffer that the next window slides
+    over, and inverse scaling runs once over the whole (N, horizon) block.
+    Returns one forecast series per context, in order.
+    """
+    series = [None] * len(contexts)
+
+    for indices in _group_by_window(contexts):
+        values = np.array(
+            [contexts[i]["historical_values"] for i in indices],
+            dtype=np.float64,
+        )
+        n_rows, window = values.shape
+
+        with stage("lstm", "feature_build"):
+            buffer = np.empty((n_rows, window + horizon, 1), dtype=np.float32)
+            buffer[:, :window, 0] = scaler.transform(
+                values.reshape(-1, 1)
+            ).reshape(n_rows, window)
+
+        timings = np.empty(horizon + 1)
+        timings[0] = time.perf_counter()
+
+        for step in range(horizon):
+            # Roll sequence forward
+            buffer[:, window + step] = step_fn(buffer[:, step:step + window])
+            timings[step + 1] = time.perf_counter()
+
+        FORECAST_STAGE_SECONDS.observe_many(np.diff(timings), model="lstm", stage="predict")
 
-        # Case-insensitive lookup
-        county_key = next(
-            (k for k in prophet_models if k.lower() == county.lower()),
-            None
+        preds_scaled = buffer[:, window:, 0].astype(np.float64)
+        preds = scaler.inverse_transform(
+            preds_scaled.reshape(-1, 1)
+        ).reshape(n_rows, horizon)
+        preds = np.maximum(np.rint(preds), 0).astype(int)
+
+        for index, row in zip(indices, preds.tolist()):
+            series[index] = forecast_columns(contexts[index], row)
+
+    return series
+
+
+def _prophet_closed_form(model):
+    """
+    True when yhat is just trend + Fourier seasonalities, i.e. no
+    holidays, extra regressors, conditional seasonalities or logistic cap.
+    """
+    return (
+        model.growth in ("linear", "flat")
+        and model.holidays is None
+        and not getattr(model, "country_holidays", None)
+        and not model.extra_regressors
+        and all(
+            props["condition_name"] is None
+            for props in model.seasonalities.values()
         )
+    )
 
-        if county_key is None:
-            raise ValueError(f"No Prophet model for county: {county}")
 
-        model = prophet_models[county_key]
+def _prophet_yhat(model, dates):
+    """
+    Evaluate trend and seasonality directly from the fitted parameters.
+
+    Mirrors Prophet's predict_trend / predict_seasonal_components for
+    closed-form models without building the seasonality feature frame.
+    """
+    t = ((dates - model.start) / model.t_scale).to_numpy(dtype=np.float64)
+    floor = model.y_min if getattr(model, "scaling", "absmax") == "minmax" else 0.0
 
-        future = model.make_future_dataframe(
-            periods=horizon,
-            freq="M",
+    trend = np.asarray(
+        model.predict_trend(pd.DataFrame({"t": t, "floor": floor})),
+        dtype=np.float64,
+    )
+
+    if not model.seasonalities:
+        return trend
+
+    days = (dates - pd.Timestamp("1970-01-01")).total_seconds().to_numpy() / 86400
+    beta = model.params["beta"]
+
+    features = []
+    multiplicative = []
+    for props in model.seasonalities.values():
+        order = props["fourier_order"]
+        angle = 2 * np.pi * days / props["period"]
+        block = np.empty((len(days), 2 * order))
+        for i in range(order):
+            block[:, 2 * i] = np.sin((i + 1) * angle)
+            block[:, 2 * i + 1] = np.cos((i + 1) * angle)
+        features.append(block)
+        multiplicative.append(
+            np.full(2 * order, props["mode"] == "multiplicative")
         )
 
-        forecast = model.predict(future).tail(horizon)
+    X = np.hstack(features)
+    is_mult = np.concatenate(multiplicative)
+
+    additive_terms = np.nanmean(X @ (beta * ~is_mult).T, axis=1) * model.y_scale
+    multiplicative_terms = np.nanmean(X @ (beta * is_mult).T, axis=1)
+
+    return trend * (1 + multiplicative_terms) + additive_terms
+
+
+def prophet_forecast(model, horizon, intervals=False):
+    """
+    Evaluate a fitted Prophet model on the future months only.
+
+    Same yhat as predict(make_future_dataframe(horizon)).tail(horizon),
+    but the history rows are never rebuilt or predicted, and uncertainty
+    sampling (the bulk of predict's cost) only runs when `intervals` is set.
+    """
+    last_date = model.history_dates.max()
+    dates = pd.date_range(start=last_date, periods=horizon + 1, freq="M")
+    dates = dates[dates > last_date][:horizon]
+
+    df = None
+
+    if _prophet_closed_form(model):
+        yhat = _prophet_yhat(model, dates)
+    else:
+        df = model.setup_dataframe(pd.DataFrame({"ds": dates}))
+        df["trend"] = model.predict_trend(df)
+        seasonal = model.predict_seasonal_components(df)
+        yhat = (
+            df["trend"].to_numpy() * (1 + seasonal["multiplicative_terms"].to_numpy())
+            + seasonal["additive_terms"].to_numpy()
+        )
+
+    forecast = {
+        "dates": np.datetime_as_string(dates.to_numpy(), unit="M").tolist(),
+        "forecast": np.maximum(yhat, 0).astype(int).tolist(),
+    }
+
+    if not intervals:
+        return forecast
+
+    if not model.uncertainty_samples:
+        raise ValueError("Prophet model was fitted without uncertainty samples")
 
-        for _, row in forecast.iterrows():
-            forecast_series.append({
-                "date": row["ds"].strftime("%Y-%m"),
-                "historical": None,
-                "forecast": int(max(row["yhat"], 0)),
-            })
+    if df is None:
+        df = model.setup_dataframe(pd.DataFrame({"ds": dates}))
+        df["trend"] = model.predict_trend(df)
+
+    bands = model.predict_uncertainty(df, True)
+    forecast["lower"] = np.maximum(bands["yhat_lower"].to_numpy(), 0).astype(int).tolist()
+    forecast["upper"] = np.maximum(bands["yhat_upper"].to_numpy(), 0).astype(int).tolist()
+
+    return forecast
+
+
+def build_result(county, model_name, horizon, context, forecast):
+    """
+    Assemble the columnar result: `dates` spans history then forecast,
+    `historical` holds the first meta["history_points"] values and
+    `forecast` (plus `lower`/`upper` with intervals) the rest.
+    """
+    result = {
+        "meta": {
+            "county": county,
+            "model": model_name,
+            "horizon": horizon,
+            "history_points": len(context["history_values"]),
+        },
+        "dates": context["history_dates"] + forecast["dates"],
+        "historical": context["history_values"],
+    }
+
+    for key, values in forecast.items():
+        if key != "dates":
+            result[key] = values
+
+    return result
+
+
+def forecast_ev_demand(
+    store: CountyStore,
+    county: str,
+    model_name: str,
+    horizon: int = 36,
+    intervals: bool = False,
+):
+    """
+    Forecast EV demand for a given county and model.
+
+    Returns a combined historical + forecast time series as parallel
+    arrays (see build_result; response_format.to_points gives the
+    per-point form the frontend charts use). With intervals=True
+    (INTERVAL_MODELS) the forecast also carries "lower"/"upper" bounds.
+    """
+
+    model_name = model_name.lower()
+    # Before the first stage(): model names label the stage metrics
+    check_model_name(model_name)
 
     # -------------------------------------------------
-    # LSTM
+    # County lookup (CASE SAFE, indexed)
     # -------------------------------------------------
-    elif model_name == "lstm":
-        model, scaler = load_lstm()
+    with stage(model_name, "lookup"):
+        context = county_context(store.get(county))
 
-        values = county_df["Electric Vehicle (EV) Total"].values.reshape(-1, 1)
-        values_scaled = scaler.transform(values)
+    if intervals and model_name not in INTERVAL_MODELS:
+        raise ValueError(f"Prediction intervals are not available for {model_name}")
 
-        window = 6
-        seq = values_scaled[-window:].copy()
-
-        for step in range(1, horizon + 1):
-            pred_scaled = model.predict(
-                seq.reshape(1, window, 1),
-                verbose=0,
-            )[0][0]
+    # -------------------------------------------------
+    # XGBOOST / RANDOM FOREST
+    # -------------------------------------------------
+    if model_name in TREE_MODELS:
+        model = load_tree_ensemble(model_name)
+        if intervals:
+            forecast = _tree_intervals(model_name, model, context, horizon)
+        else:
+            forecast = _tree_forecast(model, [context], horizon, model_name)[0]
 
-            pred = scaler.inverse_transform([[pred_scaled]])[0][0]
-            pred = max(0, int(round(pred)))
+    # -------------------------------------------------
+    # DIRECT MULTI-HORIZON TREES (ONE PREDICT)
+    # -------------------------------------------------
+    elif model_name in DIRECT_MODELS:
+        model = load_tree_ensemble(model_name)
+        forecast = _direct_forecast(model, [context], horizon, model_name)[0]
 
-            future_date = last_date + pd.DateOffset(months=step)
+    # -------------------------------------------------
+    # PROPHET (PER-COUNTY MODELS)
+    # -------------------------------------------------
+    elif model_name == "prophet":
+        # Case-insensitive, loaded on demand from the per-county files
+        with stage(model_name, "model_load"):
+            model = load_prophet(county)
 
-            forecast_series.append({
-                "date": future_date.strftime("%Y-%m"),
-                "historical": None,
-                "forecast": pred,
-            })
+        with stage(model_name, "predict_intervals" if intervals else "predict"):
+            forecast = prophet_forecast(model, horizon, intervals)
 
-            # Roll sequence forward
-            seq = np.vstack([seq[1:], [[pred_scaled]]])
+    # -------------------------------------------------
+    # LSTM
+    # -------------------------------------------------
+    elif model_name == "lstm":
+        _, scaler = load_lstm()
+        forecast = _lstm_forecast(
+            load_lstm_step(), scaler, [context], horizon
+        )[0]
 
     else:
         raise ValueError("Invalid model name")
@@ -175,12 +550,73 @@ def forecast_ev_demand(
     # -------------------------------------------------
     # FINAL RESPONSE (FRONTEND READY)
     # -------------------------------------------------
+    return build_result(county, model_name, horizon, context, forecast)
+
+
+def batched_forecast(model_name, contexts, horizon):
+    """
+    One forecast series per context for a BATCHED_MODELS model.
+    """
+    if model_name == "lstm":
+        _, scaler = load_lstm()
+        return _lstm_forecast(load_lstm_step(), scaler, contexts, horizon)
+
+    model = load_tree_ensemble(model_name)
+    if model_name in DIRECT_MODELS:
+        return _direct_forecast(model, contexts, horizon, model_name)
+    return _tree_forecast(model, contexts, horizon, model_name)
+
+
+def forecast_many(
+    store: CountyStore,
+    counties: list,
+    model_name: str,
+    horizon: int = 36,
+):
+    """
+    Forecast several counties with one model.
+
+    Tree models and the LSTM step every county together (one model call
+    per horizon month); Prophet runs forecast_ev_demand per county.
+
+    Returns {county: forecast_ev_demand result}.
+    """
+    model_name = model_name.lower()
+
+    if model_name not in BATCHED_MODELS:
+        return {
+            county: forecast_ev_demand(store, county, model_name, horizon)
+            for county in counties
+        }
+
+    with stage(model_name, "lookup"):
+        contexts = [county_context(store.get(county)) for county in counties]
+
+    forecasts = batched_forecast(model_name, contexts, horizon)
+
     return {
-        "series": historical_series + forecast_series,
-        "meta": {
-            "county": county,
-            "model": model_name,
-            "horizon": horizon,
-            "history_points": len(historical_series),
-        },
+        county: build_result(county, model_name, horizon, context, forecast)
+        for county, context, forecast in zip(counties, contexts, forecasts)
     }
+
+
+def result_from_values(
+    store: CountyStore,
+    county: str,
+    model_name: str,
+    start_month: int,
+    values,
+):
+    """
+    Build a forecast_ev_demand-shaped result from precomputed forecast
+    values (e.g. the materialized store) without running any model.
+    """
+    context = county_context(store.get(county))
+    values = np.asarray(values).tolist()
+
+    forecast = {
+        "dates": month_labels(start_month, len(values)),
+        "forecast": values,
+    }
+
+    return build_result(county, model_name, len(values), context, forecast)
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Saturated(Exception):
+    """
+    Raised when a model's executor already has its maximum number of
+    requests running or queued.
+    """
+
+
+class InferencePool:
+    """
+    Dedicated, bounded executors for model inference.
+
+    Each model gets its own thread pool so a burst of slow LSTM or Prophet
+    requests can't starve the others (or the event loop). A model admits
+    at most workers + queue_size requests at a time; beyond that run()
+    raises Saturated immediately instead of queueing without bound.
+    """
+
+    def __init__(self, workers, queue_size, default_workers=1):
+        self._executors = {}
+        self._capacity = {}
+        self._pending = {}
+
+        for name, count in {**workers, "default": default_workers}.items():
+            self._executors[name] = ThreadPoolExecutor(
+                max_workers=count,
+                thread_name_prefix=f"inference-{name}",
+            )
+            self._capacity[name] = count + queue_size
+            self._pending[name] = 0
+
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _pool_name(self, model_name):
+        return model_name if model_name in self._executors else "default"
+
+    def _release(self, name):
+        with self._lock:
+            self._pending[name] -= 1
+
+    async def run(self, model_name, fn, timeout=None):
+        """
+        Run fn() on the model's executor and await its result.
+
+        Raises Saturated when the model is at capacity and
+        asyncio.TimeoutError if the result takes longer than `timeout`.
+        The slot is held until the work actually finishes, so timed-out
+        requests still count against capacity while they run.
+        """
+        name = self._pool_name(model_name)
+
+        with self._lock:
+            if self._pending[name] >= self._capacity[name]:
+                self.rejected += 1
+                raise Saturated(f"Inference capacity reached for {model_name}")
+            self._pending[name] += 1
+
+        future = self._executors[name].submit(fn)
+        future.add_done_callback(lambda _: self._release(name))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": dict(self._pending),
+                "capacity": dict(self._capacity),
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
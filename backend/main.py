@@ -1,10 +1,73 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List
-import pandas as pd
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import os
+import threading
+import time
 
-from forecasting import forecast_ev_demand
+from county_store import load_county_store
+from data_io import dataset_path
+from forecast_cache import ForecastCache, slice_forecast
+from inference_pool import InferencePool, Saturated
+from micro_batcher import MicroBatcher
+from single_flight import SingleFlight
+from forecasting import (
+    BATCHED_MODELS,
+    DIRECT_MODELS,
+    MAX_HORIZON,
+    check_horizon,
+    check_model_name,
+    forecast_ev_demand,
+    forecast_many,
+    result_from_values,
+)
+from materialized_store import load_materialized
+from metrics import backtest_metrics
+from scenarios import DEFAULT_PERCENTILES, simulate_scenarios
+from response_format import FORMATS, format_forecast, json_bytes, ndjson_line
+from telemetry import REQUEST_SECONDS, render_histograms, render_samples, stage
+from model_loader import (
+    MODEL_ARTIFACTS,
+    WARMUP_LOADERS,
+    ModelUnavailable,
+    model_load_status,
+    warm_up,
+)
+
+# -------------------------------------------------
+# Model warm-up (comma-separated model names; empty = lazy loading only).
+# lstm is left out by default so TensorFlow is only imported on first use;
+# add it to EV_WARMUP_MODELS to pay that cost at startup instead.
+# -------------------------------------------------
+WARMUP_MODELS = [
+    name.strip()
+    for name in os.environ.get(
+        "EV_WARMUP_MODELS", "xgboost,random_forest,prophet"
+    ).split(",")
+    if name.strip()
+]
+WARMUP_WORKERS = int(os.environ.get("EV_WARMUP_WORKERS", "4"))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    unknown = [name for name in WARMUP_MODELS if name not in WARMUP_LOADERS]
+    if unknown:
+        raise ValueError(f"Unknown models in EV_WARMUP_MODELS: {unknown}")
+
+    # Load models in the background so the worker accepts traffic at once;
+    # /ready reports when the warm-up set is available.
+    threading.Thread(
+        target=warm_up,
+        args=(WARMUP_MODELS, WARMUP_WORKERS),
+        daemon=True,
+    ).start()
+    yield
+    inference_pool.shutdown()
 
 # -------------------------------------------------
 # Create FastAPI app FIRST
@@ -12,7 +75,8 @@ from forecasting import forecast_ev_demand
 app = FastAPI(
     title="EV Demand Forecasting API",
     description="AI-based EV demand forecasting with multiple models",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan,
 )
 
 # -------------------------------------------------
@@ -27,23 +91,133 @@ app.add_middleware(
 )
 
 # -------------------------------------------------
-# Load dataset ONCE
+# Request latency (exported by /metrics/runtime)
+# -------------------------------------------------
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+
+    # Route template, so per-county paths don't each get a series
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=route.path if route is not None else "unmatched",
+        status=response.status_code,
+    )
+    return response
+
+# -------------------------------------------------
+# Load dataset ONCE and index it by county
 # -------------------------------------------------
-DATA_PATH = "../data/preprocessed_ev_data.csv"
+DATA_PATH = dataset_path()
+
+# EV_SHARED_MODE=1: attach the memory-mapped arrays every worker shares
+# (see shared_arrays.py) instead of each worker parsing the dataset
+SHARED_MODE = os.environ.get("EV_SHARED_MODE", "0") == "1"
 
 try:
-    df = pd.read_csv(DATA_PATH, parse_dates=["Date"])
+    store = load_county_store(shared=SHARED_MODE)
 except Exception as e:
-    df = None
+    store = None
     print("❌ Failed to load dataset:", e)
 
+# -------------------------------------------------
+# Materialized forecasts (built offline by materialize.py)
+# EV_FORECAST_MODE=live skips the store and always runs the models.
+# -------------------------------------------------
+FORECAST_MODE = os.environ.get("EV_FORECAST_MODE", "materialized")
+
+materialized = None
+if FORECAST_MODE == "materialized":
+    try:
+        materialized = load_materialized(DATA_PATH)
+    except Exception as e:
+        print("❌ Failed to load materialized forecasts:", e)
+
+# -------------------------------------------------
+# Forecast cache (LRU, keyed on data + model versions)
+# -------------------------------------------------
+FORECAST_CACHE_SIZE = 512
+FORECAST_CACHE_TTL = None   # seconds; None = until evicted or artifacts change
+
+forecast_cache = ForecastCache(
+    DATA_PATH,
+    max_entries=FORECAST_CACHE_SIZE,
+    ttl_seconds=FORECAST_CACHE_TTL,
+)
+
+# -------------------------------------------------
+# Inference executors (per model, bounded)
+# Requests beyond workers + queue get 429; slower than the timeout, 503.
+# -------------------------------------------------
+INFERENCE_WORKERS = {
+    "xgboost": 4,
+    "random_forest": 2,
+    "xgboost_direct": 4,
+    "random_forest_direct": 2,
+    "prophet": 2,
+    "lstm": 2,
+}
+INFERENCE_QUEUE_SIZE = int(os.environ.get("EV_INFERENCE_QUEUE_SIZE", "32"))
+INFERENCE_TIMEOUT = float(os.environ.get("EV_INFERENCE_TIMEOUT", "30"))
+
+inference_pool = InferencePool(INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE)
+
+# Concurrent identical /forecast misses share one computation
+single_flight = SingleFlight()
+
+# Concurrent misses for different counties on a tree model or the LSTM
+# are merged into one lockstep batch (one predict per month)
+MICRO_BATCH_WINDOW_MS = float(os.environ.get("EV_MICRO_BATCH_WINDOW_MS", "3"))
+MICRO_BATCH_MAX = 64
+
+async def run_forecast_batch(model_name, counties, horizon):
+    return await inference_pool.run(
+        model_name,
+        lambda: forecast_many(
+            store=store,
+            counties=counties,
+            model_name=model_name,
+            horizon=horizon
+        ),
+        timeout=INFERENCE_TIMEOUT,
+    )
+
+micro_batcher = MicroBatcher(
+    run_forecast_batch,
+    window_ms=MICRO_BATCH_WINDOW_MS,
+    max_batch=MICRO_BATCH_MAX,
+)
+
 # -------------------------------------------------
 # Schemas
 # -------------------------------------------------
 class ForecastRequest(BaseModel):
     county: str
-    model_name: str   # xgboost | random_forest | prophet | lstm
-    horizon: int = 36
+    model_name: str   # xgboost | random_forest | prophet | lstm | *_direct
+    horizon: int = Field(36, ge=1, le=MAX_HORIZON)
+    intervals: bool = False   # prophet / xgboost / random_forest: add lower/upper bands
+
+class BatchForecastRequest(BaseModel):
+    counties: List[str] = []   # empty = every county
+    model_name: str
+    horizon: int = Field(36, ge=1, le=MAX_HORIZON)
+
+class StreamForecastRequest(BatchForecastRequest):
+    format: str = "points"   # points | columnar
+
+class ScenarioRequest(BaseModel):
+    county: str
+    model_name: str = "xgboost"   # tree models or lstm
+    horizon: int = Field(36, ge=1, le=MAX_HORIZON)
+    paths: Optional[int] = None   # default: scenarios.DEFAULT_PATHS within the model's budget
+    growth_shock: float = 0.01    # sd of each path's monthly growth rate shock
+    growth_bias: float = 0.0      # mean monthly rate shock (e.g. 0.01 = aggressive)
+    lag_noise: float = 0.02       # relative sd of noise on lagged values
+    percentiles: List[float] = DEFAULT_PERCENTILES
+    seed: Optional[int] = None
 
 # -------------------------------------------------
 # Routes
@@ -52,75 +226,487 @@ class ForecastRequest(BaseModel):
 def root():
     return {"message": "EV Demand Forecasting API is running"}
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 200 once the dataset and every warm-up model are
+    loaded, 503 otherwise. Reports per-model load state and durations.
+    """
+    models = model_load_status()
+    is_ready = store is not None and all(
+        models[name]["state"] == "loaded" for name in WARMUP_MODELS
+    )
+
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            "ready": is_ready,
+            "dataset_loaded": store is not None,
+            "warmup_models": WARMUP_MODELS,
+            "models": models,
+        },
+    )
+
 @app.get("/counties", response_model=List[str])
 def get_counties():
-    if df is None:
+    if store is None:
         raise HTTPException(status_code=500, detail="Dataset not loaded")
 
-    counties = sorted(df["County"].dropna().unique().tolist())
-    return counties
+    return store.counties
 
 @app.get("/models")
 def get_models():
     """
     List available forecasting models.
     Used by frontend to populate model selector.
+
+    Direct multi-horizon models are listed once they have been trained.
     """
     return [
         "xgboost",
         "random_forest",
         "prophet",
         "lstm"
-    ]
+    ] + [name for name in DIRECT_MODELS if MODEL_ARTIFACTS[name][0].exists()]
+
+# Figures from the original training runs; served until metrics.py has
+# produced a backtest table
+TRAINING_METRICS = {
+    "xgboost": {
+        "MAE": 0.06,
+        "RMSE": 0.30,
+        "MAPE": 1.84
+    },
+    "random_forest": {
+        "MAE": 0.06,
+        "RMSE": 0.60,
+        "MAPE": 2.44
+    },
+    "prophet": {
+        "MAE": 0.68,
+        "RMSE": 0.76,
+        "MAPE": 37.02
+    },
+    "lstm": {
+        "MAE": 1.26,
+        "RMSE": 2.00,
+        "MAPE": 67.30
+    }
+}
 
 @app.get("/metrics")
-def get_metrics():
+def get_metrics(county: Optional[str] = None):
     """
-    Return precomputed evaluation metrics for all models.
+    Return evaluation metrics for all models.
     Used by frontend for KPI cards and model comparison.
+
+    Served from the rolling-origin backtest table written by metrics.py
+    (overall, or for one county with ?county=).
     """
-    return {
-        "xgboost": {
-            "MAE": 0.06,
-            "RMSE": 0.30,
-            "MAPE": 1.84
-        },
-        "random_forest": {
-            "MAE": 0.06,
-            "RMSE": 0.60,
-            "MAPE": 2.44
-        },
-        "prophet": {
-            "MAE": 0.68,
-            "RMSE": 0.76,
-            "MAPE": 37.02
-        },
-        "lstm": {
-            "MAE": 1.26,
-            "RMSE": 2.00,
-            "MAPE": 67.30
-        }
-    }
+    try:
+        metrics = backtest_metrics(county)
+    except ValueError as ve:
+        raise HTTPException(status_code=404, detail=str(ve))
+
+    if metrics is None:
+        if county is not None:
+            raise HTTPException(status_code=404, detail="Per-county metrics have not been computed")
+        return TRAINING_METRICS
+
+    return metrics
+
+@app.get("/metrics/runtime", response_class=PlainTextResponse)
+def get_runtime_metrics():
+    """
+    Runtime telemetry in Prometheus text format: per-stage forecast
+    timings, model load durations, request latency, and cache /
+    executor / coalescing counters.
+    """
+    cache = forecast_cache.stats()
+    pool = inference_pool.stats()
+    flights = single_flight.stats()
+    batches = micro_batcher.stats()
+    models = model_load_status()
+
+    lines = render_histograms()
+
+    lines += render_samples(
+        "ev_forecast_cache_events_total", "counter", "Forecast cache lookups and removals.",
+        [({"event": event}, cache[event])
+         for event in ("hits", "prefix_hits", "misses", "evictions", "expirations")],
+    )
+    lines += render_samples(
+        "ev_forecast_cache_entries", "gauge", "Forecasts currently cached.",
+        [({}, cache["entries"])],
+    )
+    lines += render_samples(
+        "ev_inference_pending", "gauge", "Requests running or queued per model executor.",
+        [({"model": name}, count) for name, count in pool["pending"].items()],
+    )
+    lines += render_samples(
+        "ev_inference_capacity", "gauge", "Admission limit (workers + queue) per model executor.",
+        [({"model": name}, count) for name, count in pool["capacity"].items()],
+    )
+    lines += render_samples(
+        "ev_inference_rejected_total", "counter", "Requests refused with 429.",
+        [({}, pool["rejected"])],
+    )
+    lines += render_samples(
+        "ev_inference_timeouts_total", "counter", "Requests that hit the inference timeout.",
+        [({}, pool["timeouts"])],
+    )
+    lines += render_samples(
+        "ev_single_flight_total", "counter", "Forecast misses that started (leader) or joined (follower) a computation.",
+        [({"role": "leader"}, flights["leaders"]), ({"role": "follower"}, flights["followers"])],
+    )
+    lines += render_samples(
+        "ev_single_flight_in_flight", "gauge", "Distinct forecasts currently computing.",
+        [({}, flights["in_flight"])],
+    )
+    lines += render_samples(
+        "ev_micro_batch_batches_total", "counter", "Micro-batches flushed.",
+        [({}, batches["batches"])],
+    )
+    lines += render_samples(
+        "ev_micro_batch_requests_total", "counter", "Requests submitted to the micro-batcher.",
+        [({}, batches["requests"])],
+    )
+    lines += render_samples(
+        "ev_model_loaded", "gauge", "1 once the model is loaded.",
+        [({"model": name}, status["state"] == "loaded") for name, status in models.items()],
+    )
+    lines += render_samples(
+        "ev_model_load_last_seconds", "gauge", "Duration of the most recent load attempt.",
+        [({"model": name}, status["seconds"]) for name, status in models.items()],
+    )
+
+    return "\n".join(lines) + "\n"
+
+def lookup_forecast(county, model_name, horizon, intervals=False):
+    """
+    Cheap path, no model execution: the result cache, then the
+    materialized store. Returns None on a miss.
+    """
+    variant = "intervals" if intervals else None
+    result = forecast_cache.get(county, model_name, horizon, variant)
+
+    if result is None and materialized is not None and not intervals:
+        hit = materialized.get(county, model_name, horizon)
+        if hit is not None:
+            result = result_from_values(store, county, model_name, *hit)
+            forecast_cache.put(county, model_name, horizon, result)
+
+    return result
+
+def inference_error(e):
+    """
+    Map executor backpressure and untrained models onto HTTP status codes.
+    """
+    if isinstance(e, Saturated):
+        return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    if isinstance(e, ModelUnavailable):
+        # Like an unloaded model on /ready; the message omits the path
+        return HTTPException(status_code=503, detail=str(e))
+    return HTTPException(status_code=503, detail="Forecast timed out")
+
+async def live_forecast(county, model_name, horizon, intervals=False):
+    """
+    Run the model on its executor (micro-batched where the model
+    supports it) and cache the result.
+    """
+    if model_name in BATCHED_MODELS and not intervals:
+        # Reject unknown counties and horizons a direct model can't serve
+        # here so they can't fail a whole batch
+        store.get(county)
+        if model_name in DIRECT_MODELS:
+            # May load the model on first use; keep it off the event loop
+            await asyncio.to_thread(check_horizon, model_name, horizon)
+        result = await micro_batcher.submit(county, model_name, horizon)
+    else:
+        result = await inference_pool.run(
+            model_name,
+            lambda: forecast_ev_demand(
+                store=store,
+                county=county,
+                model_name=model_name,
+                horizon=horizon,
+                intervals=intervals
+            ),
+            timeout=INFERENCE_TIMEOUT,
+        )
+
+    forecast_cache.put(
+        county,
+        model_name,
+        horizon,
+        result,
+        "intervals" if intervals else None,
+    )
+    return result
+
+def check_format(fmt):
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {fmt}")
+
+def forecast_response(body):
+    """
+    Bodies are plain dicts and lists in either format, so they are
+    serialized here, once, by orjson without FastAPI's per-item encoding
+    pass (and inside the "serialize" stage that times it).
+    """
+    return Response(content=json_bytes(body), media_type="application/json")
 
 @app.post("/forecast")
-def forecast(request: ForecastRequest):
-    if df is None:
+async def forecast(request: ForecastRequest, format: str = "points"):
+    """
+    ?format=columnar returns parallel date/value arrays instead of
+    one object per month.
+    """
+    if store is None:
         raise HTTPException(status_code=500, detail="Dataset not loaded")
 
+    check_format(format)
+
+    model_name = request.model_name.lower()
+
     try:
-        results = forecast_ev_demand(
-            df=df,
-            county=request.county,
-            model_name=request.model_name.lower(),
-            horizon=request.horizon
+        # Unknown names would otherwise label the serialize stage
+        check_model_name(model_name)
+
+        results = lookup_forecast(
+            request.county, model_name, request.horizon, request.intervals
         )
 
-        return {
-            "county": request.county,
-            "model": request.model_name,
-            "horizon": request.horizon,
-            "forecast": results
-        }
+        if results is None:
+            results = await single_flight.do(
+                (request.county.lower(), model_name, request.horizon, request.intervals),
+                lambda: live_forecast(
+                    request.county, model_name, request.horizon, request.intervals
+                ),
+            )
+
+            # Followers may have asked with different county casing
+            results = slice_forecast(results, request.county, request.horizon)
+
+        with stage(model_name, "serialize"):
+            return forecast_response({
+                "county": request.county,
+                "model": request.model_name,
+                "horizon": request.horizon,
+                "forecast": format_forecast(results, format)
+            })
+
+    except (Saturated, asyncio.TimeoutError, ModelUnavailable) as e:
+        raise inference_error(e)
+
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/forecast/batch")
+async def forecast_batch(request: BatchForecastRequest, format: str = "points"):
+    """
+    Forecast many counties in one call.
+    Tree models advance all counties together, one predict per month.
+    """
+    if store is None:
+        raise HTTPException(status_code=500, detail="Dataset not loaded")
+
+    check_format(format)
+
+    counties = request.counties or store.counties
+    model_name = request.model_name.lower()
+
+    try:
+        # Unknown names would otherwise label the serialize stage
+        check_model_name(model_name)
+
+        results = {}
+        for county in counties:
+            cached = lookup_forecast(county, model_name, request.horizon)
+            if cached is not None:
+                results[county] = cached
+
+        missing = [county for county in counties if county not in results]
+
+        if missing:
+            computed = await run_forecast_batch(model_name, missing, request.horizon)
+
+            for county, result in computed.items():
+                forecast_cache.put(county, model_name, request.horizon, result)
+
+            results.update(computed)
+
+        with stage(model_name, "serialize"):
+            results = {
+                county: format_forecast(results[county], format)
+                for county in counties
+            }
+
+            return forecast_response({
+                "model": request.model_name,
+                "horizon": request.horizon,
+                "forecasts": results
+            })
+
+    except (Saturated, asyncio.TimeoutError, ModelUnavailable) as e:
+        raise inference_error(e)
+
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# -------------------------------------------------
+# Streaming export: one NDJSON line per county
+# -------------------------------------------------
+# Counties computed per chunk for batched models; the others (Prophet)
+# go one county at a time, so each line is sent as soon as it is ready
+STREAM_CHUNK = MICRO_BATCH_MAX
+
+def stream_record(county, model_name, horizon, result, fmt):
+    return ndjson_line({
+        "county": county,
+        "model": model_name,
+        "horizon": horizon,
+        "forecast": format_forecast(result, fmt),
+    })
+
+def stream_error(county, status, detail):
+    return ndjson_line({"county": county, "status": status, "error": detail})
+
+async def stream_forecasts(counties, model_name, horizon, fmt):
+    """
+    Yield cached/materialized counties straight away, then compute the
+    rest a chunk at a time (STREAM_CHUNK counties for batched models, one
+    otherwise), writing each chunk out before starting the next. Failures become per-county error lines; the 200
+    is already sent, so nothing may escape mid-stream.
+    """
+    missing = []
+    for county in counties:
+        if county not in store:
+            yield stream_error(county, 400, f"No data found for county: {county}")
+            continue
+
+        result = lookup_forecast(county, model_name, horizon)
+        if result is None:
+            missing.append(county)
+        else:
+            yield stream_record(county, model_name, horizon, result, fmt)
+
+    chunk_size = STREAM_CHUNK if model_name in BATCHED_MODELS else 1
+
+    for start in range(0, len(missing), chunk_size):
+        chunk = missing[start:start + chunk_size]
+
+        try:
+            computed = await run_forecast_batch(model_name, chunk, horizon)
+        except (Saturated, asyncio.TimeoutError, ModelUnavailable) as e:
+            error = inference_error(e)
+            for county in chunk:
+                yield stream_error(county, error.status_code, error.detail)
+            continue
+        except ValueError:
+            # e.g. one county without a Prophet model; isolate it
+            computed = {}
+            for county in chunk:
+                try:
+                    computed.update(await run_forecast_batch(model_name, [county], horizon))
+                except (Saturated, asyncio.TimeoutError, ModelUnavailable) as e:
+                    error = inference_error(e)
+                    yield stream_error(county, error.status_code, error.detail)
+                except ValueError as ve:
+                    yield stream_error(county, 400, str(ve))
+                except Exception as e:
+                    yield stream_error(county, 500, str(e))
+        except Exception as e:
+            for county in chunk:
+                yield stream_error(county, 500, str(e))
+            continue
+
+        for county, result in computed.items():
+            forecast_cache.put(county, model_name, horizon, result)
+            yield stream_record(county, model_name, horizon, result, fmt)
+
+@app.post("/forecast/stream")
+async def forecast_stream(request: StreamForecastRequest):
+    """
+    Bulk export as newline-delimited JSON, one county per line, sent as
+    each county is ready. format=columnar sends parallel arrays instead
+    of per-point objects.
+    """
+    if store is None:
+        raise HTTPException(status_code=500, detail="Dataset not loaded")
+
+    check_format(request.format)
+
+    model_name = request.model_name.lower()
+    try:
+        check_model_name(model_name)
+        await asyncio.to_thread(check_horizon, model_name, request.horizon)
+    except ModelUnavailable as e:
+        raise inference_error(e)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        stream_forecasts(
+            request.counties or store.counties,
+            model_name,
+            request.horizon,
+            request.format,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+# -------------------------------------------------
+# Monte Carlo scenarios
+# -------------------------------------------------
+@app.post("/scenarios")
+async def scenarios(request: ScenarioRequest):
+    """
+    Percentile bands over `paths` perturbed trajectories (growth shocks
+    and noise on the lags), plus the unperturbed forecast. All paths run
+    as one batch, one model call per month. Columnar body.
+    """
+    if store is None:
+        raise HTTPException(status_code=500, detail="Dataset not loaded")
+
+    model_name = request.model_name.lower()
+
+    try:
+        result = await inference_pool.run(
+            model_name,
+            lambda: simulate_scenarios(
+                store=store,
+                county=request.county,
+                model_name=model_name,
+                horizon=request.horizon,
+                paths=request.paths,
+                growth_shock=request.growth_shock,
+                growth_bias=request.growth_bias,
+                lag_noise=request.lag_noise,
+                percentiles=request.percentiles,
+                seed=request.seed,
+            ),
+            timeout=INFERENCE_TIMEOUT,
+        )
+
+        with stage(model_name, "serialize"):
+            return forecast_response({
+                "county": request.county,
+                "model": request.model_name,
+                "horizon": request.horizon,
+                "scenarios": result,
+            })
+
+    except (Saturated, asyncio.TimeoutError, ModelUnavailable) as e:
+        raise inference_error(e)
 
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -131,7 +717,7 @@ def forecast(request: ForecastRequest):
 # -------------------------------------------------
 # NEW ENDPOINT: /insights
 # -------------------------------------------------
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any
 
 class InsightsRequest(BaseModel):
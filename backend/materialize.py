@@ -0,0 +1,109 @@
+"""
+Precompute forecasts for every model and county into the read-only
+materialized store served by /forecast.
+
+Run from backend/ after (re)training:
+    python materialize.py --max-horizon 120
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from county_store import load_county_store
+from data_io import dataset_path
+from forecasting import MAX_HORIZON, forecast_many
+from materialized_store import (
+    INDEX_PATH,
+    MATERIALIZED_DIR,
+    VALUES_PATH,
+    current_fingerprints,
+)
+
+MODELS = ["xgboost", "random_forest", "prophet", "lstm"]
+
+
+def forecast_all(store, counties, model_name, horizon):
+    """
+    Batched forecast for every county; if any county fails (e.g. no
+    Prophet model), retry one by one and skip the failures.
+    """
+    try:
+        return forecast_many(store, counties, model_name, horizon)
+    except ValueError:
+        pass
+
+    results = {}
+    for county in counties:
+        try:
+            results[county] = forecast_many(store, [county], model_name, horizon)[county]
+        except ValueError as e:
+            print(f"  skip {county}: {e}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize forecasts for all models and counties")
+    parser.add_argument("--max-horizon", type=int, default=MAX_HORIZON)
+    parser.add_argument("--models", default=",".join(MODELS))
+    args = parser.parse_args()
+
+    model_names = [name.strip() for name in args.models.split(",") if name.strip()]
+
+    store = load_county_store()
+    counties = store.counties
+
+    # Stamp versions before running anything, so a retrain mid-job shows as stale
+    fingerprints = current_fingerprints(dataset_path(), model_names)
+
+    values = np.zeros((len(model_names), len(counties), args.max_horizon), dtype=np.int32)
+    start_months = np.full((len(model_names), len(counties)), -1, dtype=np.int64)
+
+    for m, model_name in enumerate(model_names):
+        print(f"{model_name}: {len(counties)} counties x {args.max_horizon} months")
+
+        try:
+            results = forecast_all(store, counties, model_name, args.max_horizon)
+        except Exception as e:
+            # e.g. model artifacts missing; its requests fall back to live
+            print(f"  skip {model_name}: {e}")
+            continue
+
+        for c, county in enumerate(counties):
+            result = results.get(county)
+            if result is None:
+                continue
+
+            first = result["dates"][result["meta"]["history_points"]]
+            year, month = map(int, first.split("-"))
+
+            values[m, c] = result["forecast"]
+            start_months[m, c] = year * 12 + month - 1
+
+    # ---------------------------
+    # Save (values first, index last, both via rename)
+    # ---------------------------
+    MATERIALIZED_DIR.mkdir(parents=True, exist_ok=True)
+
+    tmp_values = VALUES_PATH.with_suffix(".tmp.npy")
+    np.save(tmp_values, values)
+    os.replace(tmp_values, VALUES_PATH)
+
+    tmp_index = INDEX_PATH.with_suffix(".json.tmp")
+    with open(tmp_index, "w") as f:
+        json.dump({
+            "max_horizon": args.max_horizon,
+            "models": model_names,
+            "counties": counties,
+            "start_months": start_months.tolist(),
+            "fingerprints": fingerprints,
+        }, f)
+    os.replace(tmp_index, INDEX_PATH)
+
+    print(f"\n✅ Materialized {values.shape} forecasts to {MATERIALIZED_DIR}")
+
+
+if __name__ == "__main__":
+    main()
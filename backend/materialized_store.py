@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+
+from forecast_cache import artifact_fingerprint
+from model_loader import BASE_DIR, MODEL_ARTIFACTS
+
+# ---------------------------
+# Paths
+# ---------------------------
+MATERIALIZED_DIR = BASE_DIR / "models" / "materialized"
+VALUES_PATH = MATERIALIZED_DIR / "forecasts.npy"
+INDEX_PATH = MATERIALIZED_DIR / "index.json"
+
+
+def current_fingerprints(data_path, model_names):
+    """
+    JSON-comparable version stamps of the dataset + each model's artifacts.
+    """
+    return {
+        name: [
+            list(stamp)
+            for stamp in artifact_fingerprint([data_path] + MODEL_ARTIFACTS[name])
+        ]
+        for name in model_names
+    }
+
+
+class MaterializedForecasts:
+    """
+    Read-only view of forecasts precomputed by materialize.py.
+
+    Values live in one memory-mapped int32 array of shape
+    (models, counties, max_horizon); start_months[m, c] is the first
+    forecast month as year * 12 + month - 1 (-1 when the model had no
+    forecast for that county). Models whose dataset or artifacts changed
+    since materialization are treated as missing.
+    """
+
+    def __init__(self, data_path):
+        with open(INDEX_PATH) as f:
+            index = json.load(f)
+
+        self.max_horizon = index["max_horizon"]
+        self.values = np.load(VALUES_PATH, mmap_mode="r")
+        self.start_months = np.asarray(index["start_months"], dtype=np.int64)
+
+        self._county_index = {
+            county.lower(): i for i, county in enumerate(index["counties"])
+        }
+
+        current = current_fingerprints(data_path, index["models"])
+        self._model_index = {
+            name: i
+            for i, name in enumerate(index["models"])
+            if index["fingerprints"].get(name) == current[name]
+        }
+
+    @property
+    def models(self):
+        return list(self._model_index)
+
+    def get(self, county, model_name, horizon):
+        """
+        Return (start_month, values[:horizon]) or None on a miss (including
+        horizons outside 1..max_horizon, which fall through to live).
+        """
+        if not 1 <= horizon <= self.max_horizon:
+            return None
+
+        m = self._model_index.get(model_name)
+        c = self._county_index.get(county.lower())
+
+        if m is None or c is None:
+            return None
+
+        start = int(self.start_months[m, c])
+        if start < 0:
+            return None
+
+        return start, self.values[m, c, :horizon]
+
+
+def load_materialized(data_path):
+    """
+    Open the materialized store, or return None if it hasn't been built.
+    """
+    if not (INDEX_PATH.exists() and VALUES_PATH.exists()):
+        return None
+    return MaterializedForecasts(data_path)
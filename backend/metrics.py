@@ -0,0 +1,351 @@
+"""
+Rolling-origin backtests for every model and county, and the cached
+per-county / per-model metrics table that /metrics serves.
+
+Each county is cut at its last `origins` months that still leave
+`horizon` actuals after them, and every model forecasts `horizon`
+months from each cutoff. Tree models and the LSTM run all
+(county, cutoff) pairs as one lockstep batch, one model call per
+horizon month; Prophet refits per cutoff (the served models hold out
+only the last 12 months), fanned out over a process pool by county.
+
+The tree models and the LSTM are the served ones, trained on every
+month up to the training scripts' date split, so only cutoffs after
+training_end() are used: every model is scored out of sample, on the
+same cases. Counties whose post-split history is shorter than
+`horizon` contribute no cases.
+
+Run from backend/ after (re)training:
+    python metrics.py --origins 6 --horizon 12 --workers 8
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from county_store import CountySeries, load_county_store
+from data_io import dataset_path, load_dataset
+from feature_config import DATE_COLUMN, FEATURE_COLUMNS, TARGET_COLUMN
+from features import BASE_COLUMNS, build_features
+from forecasting import (
+    BATCHED_MODELS,
+    batched_forecast,
+    county_context,
+    prophet_forecast,
+)
+from materialized_store import current_fingerprints
+from model_loader import BASE_DIR
+
+BACKTEST_PATH = BASE_DIR / "models" / "backtest_metrics.json"
+
+# Direct models are skipped when they have not been trained
+MODELS = ["xgboost", "random_forest", "xgboost_direct", "random_forest_direct", "prophet", "lstm"]
+DEFAULT_ORIGINS = 6
+DEFAULT_HORIZON = 12
+MIN_HISTORY = 24   # same floor train_prophet uses
+# Date quantile train_xgboost / train_random_forest split at; train_lstm
+# splits its date-sorted rows at the same fraction
+TRAIN_SPLIT_QUANTILE = 0.85
+
+
+# ---------------------------
+# Backtest cases
+# ---------------------------
+def _truncated(series, end):
+    return CountySeries(
+        name=series.name,
+        dates=series.dates[:end],
+        values=series.values[:end],
+        months_since_start=series.months_since_start[:end],
+        county_encoded=series.county_encoded,
+    )
+
+
+def training_end():
+    """
+    Last date the served tree models and the LSTM saw as a target: the
+    later of the tree scripts' split (over rows with complete features)
+    and the LSTM's (over all rows).
+    """
+    tree_rows = build_features(load_dataset(BASE_COLUMNS))
+    tree_rows = tree_rows.dropna(subset=FEATURE_COLUMNS + [TARGET_COLUMN])
+    all_dates = load_dataset([DATE_COLUMN])[DATE_COLUMN]
+
+    return max(
+        tree_rows[DATE_COLUMN].quantile(TRAIN_SPLIT_QUANTILE),
+        all_dates.quantile(TRAIN_SPLIT_QUANTILE),
+    )
+
+
+def backtest_cases(store, origins, horizon, after=None):
+    """
+    Return ([(county, cutoff), ...], actuals) where actuals[i] holds the
+    `horizon` observed values after case i's cutoff. With `after`, only
+    cutoffs whose first forecast month is later than it are kept.
+    """
+    after = None if after is None else np.datetime64(pd.Timestamp(after))
+
+    cases = []
+    for county in store.counties:
+        series = store.get(county)
+        n = len(series)
+        for k in range(origins):
+            cutoff = n - horizon - k
+            if cutoff < MIN_HISTORY:
+                break
+            if after is not None and series.dates[cutoff] <= after:
+                break
+            cases.append((county, cutoff))
+
+    actuals = np.array(
+        [store.get(county).values[cutoff:cutoff + horizon] for county, cutoff in cases],
+        dtype=np.float64,
+    ).reshape(len(cases), horizon)
+
+    return cases, actuals
+
+
+# ---------------------------
+# Per-model predictions, shape (cases, horizon)
+# ---------------------------
+def _batched_predictions(store, cases, model_name, horizon):
+    contexts = [
+        county_context(_truncated(store.get(county), cutoff))
+        for county, cutoff in cases
+    ]
+
+    forecasts = batched_forecast(model_name, contexts, horizon)
+
+    return np.array([f["forecast"] for f in forecasts], dtype=np.float64)
+
+
+def _prophet_county(dates, values, cutoffs, horizon):
+    """
+    Refit Prophet at each cutoff of one county (runs in a worker process).
+    """
+    from prophet import Prophet
+
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    preds = np.empty((len(cutoffs), horizon))
+    for row, cutoff in enumerate(cutoffs):
+        model = Prophet(
+            yearly_seasonality=True,
+            weekly_seasonality=False,
+            daily_seasonality=False
+        )
+        model.fit(pd.DataFrame({"ds": dates[:cutoff], "y": values[:cutoff]}))
+        preds[row] = prophet_forecast(model, horizon)["forecast"]
+
+    return preds
+
+
+def _prophet_predictions(store, cases, horizon, workers):
+    by_county = {}
+    for index, (county, cutoff) in enumerate(cases):
+        by_county.setdefault(county, []).append((index, cutoff))
+
+    preds = np.empty((len(cases), horizon))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            county: pool.submit(
+                _prophet_county,
+                store.get(county).dates,
+                store.get(county).values,
+                [cutoff for _, cutoff in rows],
+                horizon,
+            )
+            for county, rows in by_county.items()
+        }
+
+        for county, future in futures.items():
+            rows = [index for index, _ in by_county[county]]
+            preds[rows] = future.result()
+
+    return preds
+
+
+def predict_cases(store, cases, model_name, horizon, workers=None):
+    if model_name == "prophet":
+        return _prophet_predictions(store, cases, horizon, workers)
+    if model_name in BATCHED_MODELS:
+        return _batched_predictions(store, cases, model_name, horizon)
+    raise ValueError(f"Unknown model: {model_name}")
+
+
+# ---------------------------
+# Scoring
+# ---------------------------
+def score(counties, actuals, predicted):
+    """
+    MAE / RMSE / MAPE per county and overall, pooling every origin and
+    horizon step. MAPE ignores zero actuals, as in training.
+    """
+    error = predicted - actuals
+    nonzero = actuals != 0
+    ape = np.divide(np.abs(error), np.abs(actuals), out=np.full_like(error, np.nan), where=nonzero)
+
+    points = pd.DataFrame({
+        "county": np.repeat(np.asarray(counties, dtype=object), actuals.shape[1]),
+        "abs": np.abs(error).ravel(),
+        "sq": (error ** 2).ravel(),
+        "ape": ape.ravel(),
+    })
+
+    grouped = points.groupby("county", sort=True).agg(
+        MAE=("abs", "mean"),
+        MSE=("sq", "mean"),
+        MAPE=("ape", "mean"),
+        points=("abs", "size"),
+    )
+
+    def row(mae, mse, mape, n):
+        return {
+            "MAE": float(mae),
+            "RMSE": float(np.sqrt(mse)),
+            "MAPE": None if np.isnan(mape) else float(mape * 100),
+            "points": int(n),
+        }
+
+    per_county = {
+        county: row(r.MAE, r.MSE, r.MAPE, r.points)
+        for county, r in grouped.iterrows()
+    }
+    overall = row(
+        points["abs"].mean(),
+        points["sq"].mean(),
+        points["ape"].mean() if points["ape"].notna().any() else np.nan,
+        len(points),
+    )
+
+    return overall, per_county
+
+
+def run_backtests(store, model_names, origins, horizon, workers=None, after=None):
+    cases, actuals = backtest_cases(store, origins, horizon, after)
+    counties = [county for county, _ in cases]
+    if not cases:
+        print(f"No cutoffs after {after} leave {horizon} months of actuals; lower --horizon")
+        return {}
+
+    results = {}
+    for model_name in model_names:
+        start = time.perf_counter()
+        print(f"{model_name}: {len(cases)} cases x {horizon} months")
+
+        try:
+            predicted = predict_cases(store, cases, model_name, horizon, workers)
+        except Exception as e:
+            # e.g. model artifacts missing; keep the other models
+            print(f"  skip {model_name}: {e}")
+            continue
+
+        overall, per_county = score(counties, actuals, predicted)
+        results[model_name] = {"overall": overall, "counties": per_county}
+        print(f"  {time.perf_counter() - start:.1f}s  {overall}")
+
+    return results
+
+
+# ---------------------------
+# Cached table (served by /metrics)
+# ---------------------------
+_table = None
+_table_mtime = None
+_table_lock = threading.Lock()
+
+
+def load_backtest_table():
+    """
+    The last backtest table, re-read whenever the file changes; None if
+    metrics.py has not been run.
+    """
+    global _table, _table_mtime
+
+    try:
+        mtime = BACKTEST_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    with _table_lock:
+        if mtime != _table_mtime:
+            with open(BACKTEST_PATH) as f:
+                _table = json.load(f)
+            _table_mtime = mtime
+        return _table
+
+
+def backtest_metrics(county=None):
+    """
+    {model: {"MAE", "RMSE", "MAPE"}} overall, or for one county
+    (case-insensitive). None when no table exists.
+    """
+    table = load_backtest_table()
+    if table is None:
+        return None
+
+    metrics = {}
+    for model_name, result in table["models"].items():
+        if county is None:
+            row = result["overall"]
+        else:
+            row = next(
+                (r for name, r in result["counties"].items() if name.lower() == county.lower()),
+                None,
+            )
+            if row is None:
+                continue
+        metrics[model_name] = {key: row[key] for key in ("MAE", "RMSE", "MAPE")}
+
+    if county is not None and not metrics:
+        raise ValueError(f"No backtest metrics for county: {county}")
+
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtests for all models and counties")
+    parser.add_argument("--origins", type=int, default=DEFAULT_ORIGINS)
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON)
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Prophet refit processes")
+    args = parser.parse_args()
+
+    model_names = [name.strip() for name in args.models.split(",") if name.strip()]
+
+    store = load_county_store()
+    fingerprints = current_fingerprints(dataset_path(), model_names)
+
+    after = training_end()
+    print(f"Cutoffs after the training split ({after:%Y-%m-%d})")
+
+    results = run_backtests(store, model_names, args.origins, args.horizon, args.workers, after)
+    if not results:
+        raise SystemExit(f"No backtest results; {BACKTEST_PATH} left unchanged")
+
+    BACKTEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = BACKTEST_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "generated_at": pd.Timestamp.now(tz="UTC").isoformat(),
+            "origins": args.origins,
+            "horizon": args.horizon,
+            "cutoffs_after": after.strftime("%Y-%m-%d"),
+            "fingerprints": fingerprints,
+            "models": results,
+        }, f)
+    os.replace(tmp_path, BACKTEST_PATH)
+
+    print(f"\n✅ Backtest metrics saved to {BACKTEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import asyncio
+
+from forecast_cache import slice_forecast
+
+
+class MicroBatcher:
+    """
+    Merge concurrent forecast requests for the same model into one batch.
+
+    Requests arriving within `window_ms` of the first one (or until
+    `max_batch` accumulate) are flushed together through
+    run_batch(model_name, counties, horizon), which steps every county in
+    lockstep with one predict per month (see forecasting.forecast_many).
+    The batch runs at the longest requested horizon and each caller gets
+    its own prefix back.
+    """
+
+    def __init__(self, run_batch, window_ms=3.0, max_batch=64):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._pending = {}
+        self._timers = {}
+
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, county, model_name, horizon):
+        """
+        Queue one request and await its forecast_ev_demand-shaped result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(model_name, [])
+        pending.append((county, horizon, future))
+        self.requests += 1
+
+        if len(pending) >= self.max_batch:
+            self._flush(model_name)
+        elif model_name not in self._timers:
+            self._timers[model_name] = asyncio.get_running_loop().call_later(
+                self.window, self._flush, model_name
+            )
+
+        return await future
+
+    def _flush(self, model_name):
+        timer = self._timers.pop(model_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(model_name, [])
+        if batch:
+            self.batches += 1
+            asyncio.ensure_future(self._run(model_name, batch))
+
+    async def _run(self, model_name, batch):
+        # One row per distinct county, keyed case-insensitively
+        counties = {}
+        for county, _, _ in batch:
+            counties.setdefault(county.lower(), county)
+
+        horizon = max(h for _, h, _ in batch)
+
+        try:
+            results = await self.run_batch(model_name, list(counties.values()), horizon)
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for county, h, future in batch:
+            if not future.done():
+                result = results[counties[county.lower()]]
+                future.set_result(slice_forecast(result, county, h))
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
@@ -1,27 +1,126 @@
 import joblib
+import json
+import os
 import pickle
-import tensorflow as tf
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+from telemetry import MODEL_LOAD_SECONDS
+
+# TensorFlow is imported inside the LSTM loaders only, so workers that
+# never serve the LSTM don't pay its multi-second import.
+
 # ---------------------------
 # Paths
 # ---------------------------
-BASE_DIR = Path(__file__).resolve().parent.parent
+# EV_BASE_DIR points the backend at another data/ + models/ tree (e.g.
+# the synthetic fixture benchmark_suite.py builds)
+BASE_DIR = Path(os.environ.get("EV_BASE_DIR") or Path(__file__).resolve().parent.parent)
 
 XGB_PATH = BASE_DIR / "models" / "xgboost_ev_model.pkl"
 RF_PATH = BASE_DIR / "models" / "random_forest_ev_model.pkl"
-PROPHET_PATH = BASE_DIR / "models" / "prophet_models.pkl"
+# Direct multi-horizon variants (train_*.py --direct H)
+XGB_DIRECT_PATH = BASE_DIR / "models" / "xgboost_ev_direct.pkl"
+RF_DIRECT_PATH = BASE_DIR / "models" / "random_forest_ev_direct.pkl"
+# Lower / upper quantile model trained alongside XGB_PATH (intervals)
+XGB_QUANTILE_PATH = BASE_DIR / "models" / "xgboost_ev_quantiles.pkl"
+PROPHET_PATH = BASE_DIR / "models" / "prophet_models.pkl"   # legacy, all counties
+PROPHET_DIR = BASE_DIR / "models" / "prophet"
+PROPHET_MANIFEST_PATH = PROPHET_DIR / "manifest.json"
 LSTM_PATH = BASE_DIR / "models" / "lstm_ev_model.h5"
 LSTM_SCALER_PATH = BASE_DIR / "models" / "lstm_scaler.pkl"
 
+# Files each model is loaded from (used to fingerprint cached forecasts)
+MODEL_ARTIFACTS = {
+    "xgboost": [XGB_PATH],
+    "random_forest": [RF_PATH],
+    "xgboost_direct": [XGB_DIRECT_PATH],
+    "random_forest_direct": [RF_DIRECT_PATH],
+    "prophet": [PROPHET_MANIFEST_PATH, PROPHET_PATH],
+    "lstm": [LSTM_PATH, LSTM_SCALER_PATH],
+}
+
+# Extra files behind a model's "intervals" forecasts (fingerprinted for
+# that cache variant only, so they never invalidate point forecasts)
+INTERVAL_ARTIFACTS = {
+    "xgboost": [XGB_QUANTILE_PATH],
+}
+
+# Tree model pickles served through flattened copies, memory-mapped from
+# shared bundles (see tree_ensemble.py)
+TREE_MODEL_PATHS = {
+    "xgboost": XGB_PATH,
+    "random_forest": RF_PATH,
+    "xgboost_direct": XGB_DIRECT_PATH,
+    "random_forest_direct": RF_DIRECT_PATH,
+    "xgboost_quantiles": XGB_QUANTILE_PATH,
+}
+
+
+class ModelUnavailable(Exception):
+    """
+    Raised when a model's artifacts are not on disk (not trained or not
+    deployed). The message names the model, never the file path.
+    """
+
+
+def _require_artifacts(name, paths):
+    if not all(Path(path).exists() for path in paths):
+        raise ModelUnavailable(f"Model '{name}' is not available")
+
+
 # ---------------------------
 # Cached models
 # ---------------------------
 _xgb_model = None
 _rf_model = None
+_tree_ensembles = {}
 _prophet_models = None
+_prophet_manifest = None
 _lstm_model = None
 _lstm_scaler = None
+_lstm_step = None
+
+# ---------------------------
+# Load state (reported by /ready)
+# ---------------------------
+_load_locks = {name: threading.Lock() for name in {**MODEL_ARTIFACTS, **TREE_MODEL_PATHS}}
+_lstm_step_lock = threading.Lock()
+_load_status = {
+    name: {"state": "not_loaded", "seconds": None, "error": None}
+    for name in {**MODEL_ARTIFACTS, **TREE_MODEL_PATHS}
+}
+
+
+def _timed_load(name, loader):
+    """
+    Run loader(), recording state and wall time for `name`.
+    Callers hold _load_locks[name] so a model is only loaded once.
+    """
+    status = _load_status[name]
+    status.update(state="loading", error=None)
+    start = time.perf_counter()
+
+    try:
+        result = loader()
+    except Exception as e:
+        status.update(state="failed", seconds=time.perf_counter() - start, error=str(e))
+        raise
+    finally:
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, model=name)
+
+    status.update(state="loaded", seconds=time.perf_counter() - start)
+    return result
+
+
+def model_load_status():
+    """
+    Snapshot of per-model load state and load durations (seconds).
+    """
+    return {name: dict(status) for name, status in _load_status.items()}
 
 
 # ---------------------------
@@ -30,56 +129,250 @@ _lstm_scaler = None
 def load_xgboost():
     global _xgb_model
     if _xgb_model is None:
-        _xgb_model = joblib.load(XGB_PATH)
+        with _load_locks["xgboost"]:
+            if _xgb_model is None:
+                _xgb_model = _timed_load("xgboost", lambda: joblib.load(XGB_PATH))
     return _xgb_model
 
 
 def load_random_forest():
     global _rf_model
     if _rf_model is None:
-        _rf_model = joblib.load(RF_PATH)
+        with _load_locks["random_forest"]:
+            if _rf_model is None:
+                _rf_model = _timed_load("random_forest", lambda: joblib.load(RF_PATH))
     return _rf_model
 
 
+def tree_ensemble_bundle(model_name):
+    return f"{model_name}_trees", [TREE_MODEL_PATHS[model_name]]
+
+
+def _read_tree_ensemble(model_name):
+    from shared_arrays import open_bundle, publish_bundle
+    from tree_ensemble import TreeEnsemble, flatten_model
+
+    name, sources = tree_ensemble_bundle(model_name)
+    _require_artifacts(model_name, sources)
+    bundle = open_bundle(name, sources)
+
+    if bundle is None:
+        arrays, meta = flatten_model(joblib.load(sources[0]))
+        try:
+            bundle = publish_bundle(name, sources, arrays, meta)
+        except OSError:
+            # models/ not writable: serve from memory in this worker
+            bundle = arrays, meta
+
+    return TreeEnsemble(*bundle)
+
+
+def load_tree_ensemble(model_name):
+    """
+    Array-backed ensemble for a TREE_MODEL_PATHS model, flattened from
+    the pickle on first use if no bundle exists for it yet.
+    """
+    ensemble = _tree_ensembles.get(model_name)
+    if ensemble is None:
+        with _load_locks[model_name]:
+            ensemble = _tree_ensembles.get(model_name)
+            if ensemble is None:
+                ensemble = _tree_ensembles[model_name] = _timed_load(
+                    model_name, lambda: _read_tree_ensemble(model_name)
+                )
+    return ensemble
+
+
 # ---------------------------
 # Prophet (per-county models)
 # ---------------------------
+# Per-county models are deserialized on first use; at most this many
+# stay resident (least recently used are dropped).
+PROPHET_CACHE_SIZE = 64
+
+_prophet_cache = OrderedDict()
+_prophet_cache_lock = threading.Lock()
+
+
+def _read_prophet_models():
+    with open(PROPHET_PATH, "rb") as f:
+        return pickle.load(f)
+
+
 def load_prophet_models():
+    """
+    Legacy: unpickle every county's model from prophet_models.pkl.
+    Only used when the per-county manifest has not been generated.
+    """
     global _prophet_models
     if _prophet_models is None:
-        with open(PROPHET_PATH, "rb") as f:
-            _prophet_models = pickle.load(f)
+        with _load_locks["prophet"]:
+            if _prophet_models is None:
+                _prophet_models = _timed_load("prophet", _read_prophet_models)
     return _prophet_models
 
 
+def _read_prophet_manifest():
+    global _prophet_models
+
+    if not PROPHET_MANIFEST_PATH.exists():
+        # Fall back to the monolithic pickle, indexed the same way
+        _prophet_models = _read_prophet_models()
+        return {
+            county.lower(): {"county": county, "file": None}
+            for county in _prophet_models
+        }
+
+    with open(PROPHET_MANIFEST_PATH) as f:
+        counties = json.load(f)["counties"]
+
+    return {
+        county.lower(): {"county": county, **entry}
+        for county, entry in counties.items()
+    }
+
+
+def load_prophet_manifest():
+    """
+    Case-folded county -> {"county", "file", ...} index of Prophet models.
+    Loading it is cheap and independent of the number of counties.
+    """
+    global _prophet_manifest
+    if _prophet_manifest is None:
+        with _load_locks["prophet"]:
+            if _prophet_manifest is None:
+                _prophet_manifest = _timed_load("prophet", _read_prophet_manifest)
+    return _prophet_manifest
+
+
+def _read_prophet_county(entry):
+    if entry["file"] is None:
+        return load_prophet_models()[entry["county"]]
+
+    from prophet.serialize import model_from_json
+
+    with open(PROPHET_DIR / entry["file"]) as f:
+        return model_from_json(f.read())
+
+
 def load_prophet(county: str):
     """
-    Return Prophet model for a specific county
+    Return Prophet model for a specific county (case-insensitive)
     """
-    models = load_prophet_models()
+    key = county.lower()
+    entry = load_prophet_manifest().get(key)
 
-    if county not in models:
+    if entry is None:
         raise ValueError(f"No Prophet model found for county: {county}")
 
-    return models[county]
+    with _prophet_cache_lock:
+        model = _prophet_cache.get(key)
+        if model is not None:
+            _prophet_cache.move_to_end(key)
+            return model
+
+    with MODEL_LOAD_SECONDS.time(model="prophet_county"):
+        model = _read_prophet_county(entry)
+
+    with _prophet_cache_lock:
+        _prophet_cache[key] = model
+        _prophet_cache.move_to_end(key)
+        while len(_prophet_cache) > PROPHET_CACHE_SIZE:
+            _prophet_cache.popitem(last=False)
+
+    return model
 
 
 # ---------------------------
 # LSTM
 # ---------------------------
+def _read_lstm():
+    _require_artifacts("lstm", MODEL_ARTIFACTS["lstm"])
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(LSTM_PATH, compile=False)
+    scaler = joblib.load(LSTM_SCALER_PATH)
+    return model, scaler
+
+
 def load_lstm():
     global _lstm_model, _lstm_scaler
     if _lstm_model is None:
-        _lstm_model = tf.keras.models.load_model(LSTM_PATH, compile=False)
-        _lstm_scaler = joblib.load(LSTM_SCALER_PATH)
+        with _load_locks["lstm"]:
+            if _lstm_model is None:
+                _lstm_model, _lstm_scaler = _timed_load("lstm", _read_lstm)
     return _lstm_model, _lstm_scaler
 
 
+def load_lstm_step():
+    """
+    Compiled single-step LSTM call: (N, window, 1) float32 -> (N, 1).
+    Skips model.predict's per-call setup and retraces only once.
+    """
+    global _lstm_step
+    if _lstm_step is None:
+        with _lstm_step_lock:
+            if _lstm_step is None:
+                _lstm_step = _compile_lstm_step(load_lstm()[0])
+    return _lstm_step
+
+
+def _compile_lstm_step(model):
+    import tensorflow as tf
+
+    window = model.input_shape[1]
+
+    @tf.function(
+        input_signature=[tf.TensorSpec([None, window, 1], tf.float32)]
+    )
+    def step(x):
+        return model(x, training=False)
+
+    # Trace now rather than on the first request
+    step(tf.zeros([1, window, 1]))
+
+    return lambda x: step(x).numpy()
+
+
+# ---------------------------
+# Warm-up
+# ---------------------------
+WARMUP_LOADERS = {
+    "xgboost": lambda: load_tree_ensemble("xgboost"),
+    "random_forest": lambda: load_tree_ensemble("random_forest"),
+    "xgboost_direct": lambda: load_tree_ensemble("xgboost_direct"),
+    "random_forest_direct": lambda: load_tree_ensemble("random_forest_direct"),
+    "prophet": load_prophet_manifest,
+    "lstm": load_lstm_step,
+}
+
+
+def warm_up(model_names=None, max_workers=4):
+    """
+    Load the given models (default: all) concurrently in a thread pool.
+    Failures are recorded in model_load_status() rather than raised.
+    """
+    names = list(model_names) if model_names is not None else list(WARMUP_LOADERS)
+
+    unknown = [name for name in names if name not in WARMUP_LOADERS]
+    if unknown:
+        raise ValueError(f"Unknown models for warm-up: {unknown}")
+
+    if not names:
+        return model_load_status()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+        wait([pool.submit(WARMUP_LOADERS[name]) for name in names])
+
+    return model_load_status()
+
+
 # ---------------------------
 # Debug test
 # ---------------------------
 if __name__ == "__main__":
-    print(load_xgboost())
-    print(load_random_forest())
-    print(len(load_prophet_models()))
+    print(len(load_tree_ensemble("xgboost")))
+    print(len(load_tree_ensemble("random_forest")))
+    print(len(load_prophet_manifest()))
     print(load_lstm()[0])
+    print(model_load_status())
@@ -0,0 +1,55 @@
+import orjson
+
+FORMATS = ["points", "columnar"]
+
+
+def to_points(result):
+    """
+    Per-point form of a forecast_ev_demand result: one
+    {"date", "historical", "forecast"} dict per month (plus
+    "lower"/"upper" when the result has intervals), as the charts use.
+    """
+    meta = result["meta"]
+    split = meta["history_points"]
+    dates = result["dates"]
+
+    series = [
+        {"date": date, "historical": value, "forecast": None}
+        for date, value in zip(dates[:split], result["historical"])
+    ]
+
+    if "lower" in result:
+        series += [
+            {"date": date, "historical": None, "forecast": value, "lower": low, "upper": high}
+            for date, value, low, high in zip(
+                dates[split:], result["forecast"], result["lower"], result["upper"]
+            )
+        ]
+    else:
+        series += [
+            {"date": date, "historical": None, "forecast": value}
+            for date, value in zip(dates[split:], result["forecast"])
+        ]
+
+    return {"series": series, "meta": meta}
+
+
+def format_forecast(result, fmt):
+    """
+    Render a result in the requested response format. Results are
+    already columnar, so that format is the result itself.
+    """
+    if fmt == "columnar":
+        return result
+    return to_points(result)
+
+
+def json_bytes(obj):
+    return orjson.dumps(obj)
+
+
+def ndjson_line(obj):
+    """
+    One newline-terminated JSON record.
+    """
+    return json_bytes(obj) + b"\n"
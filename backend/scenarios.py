@@ -0,0 +1,234 @@
+"""
+Monte Carlo scenarios: many perturbed trajectories of one county's
+forecast, summarized as percentile bands.
+
+Every path is one row of a single batch, so each horizon month is one
+model call over all paths: one FeatureBuffer matrix for the recursive
+tree models, one (paths, window, 1) tensor for the LSTM, and a single
+predict for the direct models. Paths are perturbed two ways:
+
+- growth shocks: each path draws a monthly rate r ~ N(growth_bias,
+  growth_shock) and every prediction it feeds back is scaled by 1 + r,
+  so the shock compounds through the lags (direct models, which have no
+  feedback, apply the compounded factor to their outputs);
+- lag noise: relative Gaussian noise (sd lag_noise) on the seed window
+  and on every value fed back into it.
+
+An extra unperturbed row runs alongside and is returned as "forecast";
+it reproduces the point forecast.
+"""
+
+import numpy as np
+
+from feature_builder import FeatureBuffer
+from forecasting import (
+    DIRECT_MODELS,
+    MAX_HORIZON,
+    TREE_MODELS,
+    build_result,
+    county_context,
+    forecast_columns,
+)
+from model_loader import load_lstm, load_lstm_step, load_tree_ensemble
+from telemetry import stage
+
+SCENARIO_MODELS = TREE_MODELS + DIRECT_MODELS + ["lstm"]
+
+DEFAULT_PATHS = 500
+MAX_PATHS = 5000
+# Tree-model work per request, in node visits: paths x trees x depth x
+# model calls (the horizon for recursive models, one for direct ones).
+# The NumPy evaluator does ~70M visits/s on one core, so a request stays
+# under a second, far inside EV_INFERENCE_TIMEOUT.
+NODE_VISIT_BUDGET = 50_000_000
+DEFAULT_PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def _perturb(predicted, growth, noise):
+    """
+    Next value of every path: the prediction scaled by the path's growth
+    factor and by relative noise, clipped at 0.
+    """
+    return np.maximum(predicted * growth * (1 + noise), 0)
+
+
+def _seed_windows(context, rows, sigma, rng):
+    window = np.asarray(context["historical_values"], dtype=np.float64)
+    noise = rng.standard_normal((rows, len(window))) * sigma[:, None]
+    return np.maximum(np.rint(window * (1 + noise)), 0)
+
+
+def _tree_paths(model, context, seed, growth, sigma, horizon, rng):
+    rows = len(seed)
+
+    state = FeatureBuffer(
+        historical_values=seed,
+        county_encoded=context["county_encoded"],
+        months_since_start=context["months_since_start"],
+        last_year=context["last_date"].year,
+        last_month=context["last_date"].month,
+    )
+
+    paths = np.empty((rows, horizon))
+
+    for step in range(1, horizon + 1):
+        predicted = np.maximum(np.rint(model.predict(state.fill(step))), 0)
+        noise = rng.standard_normal(rows) * sigma
+        # Rounded like the point recursion before it is fed back
+        paths[:, step - 1] = np.rint(_perturb(predicted, growth, noise))
+        state.push(paths[:, step - 1])
+
+    return paths
+
+
+def _direct_paths(model, context, seed, growth, sigma, horizon, rng, model_name):
+    if horizon > model.n_outputs:
+        raise ValueError(f"{model_name} forecasts at most {model.n_outputs} months")
+
+    rows = len(seed)
+    state = FeatureBuffer(
+        historical_values=seed,
+        county_encoded=context["county_encoded"],
+        months_since_start=context["months_since_start"],
+        last_year=context["last_date"].year,
+        last_month=context["last_date"].month,
+    )
+    predicted = model.predict(state.fill(1)).reshape(rows, -1)
+
+    # No feedback to carry the shocks, so compound them explicitly
+    noise = rng.standard_normal((rows, horizon)) * sigma[:, None]
+    factor = np.cumprod(growth[:, None] * (1 + noise), axis=1)
+
+    return np.rint(np.maximum(predicted[:, :horizon], 0) * factor)
+
+
+def _lstm_paths(step_fn, scaler, seed, growth, sigma, horizon, rng):
+    rows, window = seed.shape
+
+    buffer = np.empty((rows, window + horizon, 1), dtype=np.float32)
+    buffer[:, :window, 0] = scaler.transform(seed.reshape(-1, 1)).reshape(rows, window)
+
+    paths = np.empty((rows, horizon))
+
+    for step in range(horizon):
+        output = step_fn(buffer[:, step:step + window])
+        predicted = scaler.inverse_transform(output.astype(np.float64))[:, 0]
+        noise = rng.standard_normal(rows) * sigma
+        paths[:, step] = _perturb(predicted, growth, noise)
+        # Rounded before it is fed back, as in _tree_paths; the baseline
+        # row keeps the unrounded model output, as the point forecast does
+        paths[:-1, step] = np.rint(paths[:-1, step])
+        buffer[:, window + step, 0] = scaler.transform(paths[:, step:step + 1])[:, 0]
+        buffer[-1, window + step] = output[-1]
+
+    return np.rint(paths)
+
+
+def path_limit(model, model_name, horizon):
+    """
+    Most paths one request may simulate: MAX_PATHS, and for the tree
+    models whatever fits NODE_VISIT_BUDGET. Raises ValueError when not
+    even one path fits.
+    """
+    if model is None:
+        return MAX_PATHS
+
+    calls = 1 if model_name in DIRECT_MODELS else horizon
+    per_path = len(model) * max(model.max_depth, 1) * calls
+    if per_path > NODE_VISIT_BUDGET:
+        raise ValueError(
+            f"{model_name} is too large to simulate a {horizon}-month horizon"
+        )
+    return int(min(MAX_PATHS, NODE_VISIT_BUDGET // per_path))
+
+
+def _check_params(model_name, horizon, paths, growth_shock, lag_noise, percentiles):
+    if model_name not in SCENARIO_MODELS:
+        raise ValueError(f"Scenarios are not available for {model_name}")
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+    if paths is not None and not 1 <= paths <= MAX_PATHS:
+        raise ValueError(f"paths must be between 1 and {MAX_PATHS}")
+    if growth_shock < 0 or lag_noise < 0:
+        raise ValueError("growth_shock and lag_noise must be non-negative")
+    if not percentiles or any(not 0 <= q <= 100 for q in percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+
+
+def simulate_scenarios(
+    store,
+    county,
+    model_name,
+    horizon=36,
+    paths=None,
+    growth_shock=0.01,
+    growth_bias=0.0,
+    lag_noise=0.02,
+    percentiles=DEFAULT_PERCENTILES,
+    seed=None,
+):
+    """
+    Simulate `paths` perturbed trajectories and return the columnar
+    forecast result (see forecasting.build_result) with the unperturbed
+    "forecast", the path "mean" and one "bands" series per percentile
+    ("p5", "p50", ...).
+
+    paths defaults to DEFAULT_PATHS, lowered to path_limit() for large
+    tree models and long horizons; asking for more than the limit is a
+    ValueError.
+    """
+    model_name = model_name.lower()
+    _check_params(model_name, horizon, paths, growth_shock, lag_noise, percentiles)
+
+    with stage(model_name, "lookup"):
+        context = county_context(store.get(county))
+
+    model = None if model_name == "lstm" else load_tree_ensemble(model_name)
+    limit = path_limit(model, model_name, horizon)
+    if paths is None:
+        paths = min(DEFAULT_PATHS, limit)
+    elif paths > limit:
+        raise ValueError(
+            f"{model_name} allows at most {limit} paths for a {horizon}-month horizon"
+        )
+
+    rng = np.random.default_rng(seed)
+    rows = paths + 1   # last row: unperturbed baseline
+
+    growth = np.maximum(1 + rng.normal(growth_bias, growth_shock, rows), 0)
+    growth[-1] = 1.0
+    sigma = np.full(rows, lag_noise)
+    sigma[-1] = 0.0
+
+    with stage(model_name, "scenarios"):
+        windows = _seed_windows(context, rows, sigma, rng)
+
+        if model_name == "lstm":
+            _, scaler = load_lstm()
+            values = _lstm_paths(load_lstm_step(), scaler, windows, growth, sigma, horizon, rng)
+        elif model_name in DIRECT_MODELS:
+            values = _direct_paths(
+                model, context, windows, growth, sigma, horizon, rng, model_name
+            )
+        else:
+            values = _tree_paths(model, context, windows, growth, sigma, horizon, rng)
+
+        simulated = values[:-1]
+        bands = np.percentile(simulated, percentiles, axis=0)
+
+    forecast = forecast_columns(context, values[-1].astype(int).tolist())
+    forecast["mean"] = np.round(simulated.mean(axis=0), 1).tolist()
+    forecast["bands"] = {
+        f"p{q:g}": np.round(band, 1).tolist()
+        for q, band in zip(percentiles, bands)
+    }
+
+    result = build_result(county, model_name, horizon, context, forecast)
+    result["meta"].update(
+        paths=paths,
+        growth_shock=growth_shock,
+        growth_bias=growth_bias,
+        lag_noise=lag_noise,
+        seed=seed,
+    )
+    return result
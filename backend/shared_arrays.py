@@ -0,0 +1,133 @@
+"""
+Read-only array bundles shared by every serving worker.
+
+A bundle is a directory of .npy files plus meta.json, named after the
+fingerprint of the artifacts it was derived from. Workers open the
+arrays with mmap_mode="r", so N workers share one copy through the OS
+page cache instead of each holding its own. Publishing is atomic (write
+to a temporary directory, then rename), and whichever worker or preload
+run gets there first wins; a changed dataset or model simply produces a
+new bundle name.
+
+Holds the county store and the flattened tree models. Prebuild before
+starting the workers (from backend/):
+    python shared_arrays.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from forecast_cache import artifact_fingerprint
+from model_loader import BASE_DIR
+
+SHARED_DIR = BASE_DIR / "models" / "shared"
+
+
+def bundle_path(name, sources):
+    """
+    Directory of bundle `name` built from the files in `sources`.
+    """
+    stamp = json.dumps(artifact_fingerprint(sources), sort_keys=True)
+    digest = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+    return SHARED_DIR / f"{name}-{digest}"
+
+
+def open_bundle(name, sources):
+    """
+    Return (arrays, meta) with every array memory-mapped read-only, or
+    None if no bundle exists for the current state of `sources`.
+    """
+    path = bundle_path(name, sources)
+    meta_path = path / "meta.json"
+
+    if not meta_path.exists():
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    arrays = {
+        key: np.load(path / f"{key}.npy", mmap_mode="r")
+        for key in meta["arrays"]
+    }
+    return arrays, meta["meta"]
+
+
+def publish_bundle(name, sources, arrays, meta):
+    """
+    Write a bundle for the current state of `sources` (a no-op if one is
+    already there) and return it opened as by open_bundle.
+    """
+    path = bundle_path(name, sources)
+
+    if not path.exists():
+        SHARED_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = SHARED_DIR / f".{path.name}.{uuid.uuid4().hex}.tmp"
+        tmp_path.mkdir()
+
+        for key, array in arrays.items():
+            np.save(tmp_path / f"{key}.npy", np.ascontiguousarray(array), allow_pickle=False)
+
+        # meta.json last: its presence marks the bundle complete
+        with open(tmp_path / "meta.json", "w") as f:
+            json.dump({"arrays": list(arrays), "meta": meta}, f)
+
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another worker published it first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return open_bundle(name, sources)
+
+
+def open_or_publish(name, sources, build):
+    """
+    Open the current bundle, building it with build() -> (arrays, meta)
+    when missing.
+    """
+    bundle = open_bundle(name, sources)
+    if bundle is None:
+        bundle = publish_bundle(name, sources, *build())
+    return bundle
+
+
+def prune(keep):
+    """
+    Remove bundle directories not in `keep` (paths), e.g. ones built
+    from an older dataset or model. Only safe while no worker uses them.
+    """
+    if not SHARED_DIR.exists():
+        return []
+
+    keep = {path.name for path in keep}
+    removed = []
+    for path in SHARED_DIR.iterdir():
+        if path.is_dir() and path.name not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+    return removed
+
+
+if __name__ == "__main__":
+    from county_store import shared_county_store_path, load_county_store
+    from model_loader import TREE_MODEL_PATHS, load_tree_ensemble, tree_ensemble_bundle
+
+    load_county_store(shared=True)
+    current = [shared_county_store_path()]
+
+    # Flattened tree models (see tree_ensemble.py)
+    for model_name, path in TREE_MODEL_PATHS.items():
+        if path.exists():
+            load_tree_ensemble(model_name)
+            current.append(bundle_path(*tree_ensemble_bundle(model_name)))
+
+    for path in current:
+        print(f"✅ {path}")
+    for name in prune(current):
+        print(f"   removed stale bundle {name}")
@@ -0,0 +1,50 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical requests onto one in-flight computation.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task and receive its result (or exception). The
+    key is forgotten as soon as the task finishes, so nothing is cached
+    here; that is ForecastCache's job.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+        self.leaders = 0
+        self.followers = 0
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, fn):
+        """
+        Await fn() (a coroutine function), sharing it with concurrent
+        callers that use the same key.
+        """
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        # One caller disconnecting must not cancel the work for the others
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
@@ -0,0 +1,148 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Seconds; spans a single tree step (~10us) up to a cold model load
+DEFAULT_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    """
+    Minimal thread-safe Prometheus histogram keyed by label values.
+
+    Observations are binned on arrival (cumulative counts are only
+    formed when rendering), and observe_many() bins a whole array of
+    per-step timings under one lock acquisition.
+    """
+
+    def __init__(self, name, help_text, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _state(self, labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        state = self._series.get(key)
+        if state is None:
+            # counts per bucket (+Inf last), sum
+            state = self._series[key] = [np.zeros(len(self.buckets) + 1, dtype=np.int64), 0.0]
+        return state
+
+    def observe(self, value, **labels):
+        index = int(np.searchsorted(self.buckets, value))
+        with self._lock:
+            state = self._state(labels)
+            state[0][index] += 1
+            state[1] += value
+
+    def observe_many(self, values, **labels):
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+
+        counts = np.bincount(
+            np.searchsorted(self.buckets, values),
+            minlength=len(self.buckets) + 1,
+        )
+        with self._lock:
+            state = self._state(labels)
+            state[0] += counts
+            state[1] += float(values.sum())
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            series = [(key, counts.copy(), total) for key, (counts, total) in self._series.items()]
+
+        for key, counts, total in sorted(series, key=lambda item: item[0]):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = np.cumsum(counts)
+
+            for bound, count in zip(self.buckets.tolist(), cumulative[:-1].tolist()):
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': repr(bound)})} {count}")
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {cumulative[-1]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(labels)} {cumulative[-1]}")
+
+        return lines
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels.items()
+    )
+    return "{" + body + "}"
+
+
+def render_samples(name, metric_type, help_text, samples):
+    """
+    Prometheus text lines for a counter/gauge given [(labels, value), ...].
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f"{name}{_labels(labels)} {float(value)}")
+    return lines
+
+
+# ---------------------------
+# Hot-path histograms
+# ---------------------------
+FORECAST_STAGE_SECONDS = Histogram(
+    "ev_forecast_stage_seconds",
+    "Time spent per forecast stage; feature_build and predict are per horizon step.",
+    ["model", "stage"],
+)
+
+MODEL_LOAD_SECONDS = Histogram(
+    "ev_model_load_seconds",
+    "Model artifact load durations.",
+    ["model"],
+)
+
+REQUEST_SECONDS = Histogram(
+    "ev_http_request_seconds",
+    "End-to-end HTTP request latency.",
+    ["method", "route", "status"],
+)
+
+HISTOGRAMS = [FORECAST_STAGE_SECONDS, MODEL_LOAD_SECONDS, REQUEST_SECONDS]
+
+
+def stage(model_name, name):
+    """
+    Context manager timing one forecast stage.
+    """
+    return FORECAST_STAGE_SECONDS.time(model=model_name, stage=name)
+
+
+def render_histograms():
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return lines
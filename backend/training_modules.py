@@ -0,0 +1,16 @@
+"""
+Make the modules serving shares with training/ (data_io, feature_config)
+importable from backend/.
+
+Import this before them:
+    import training_modules  # noqa: F401
+"""
+
+import sys
+from pathlib import Path
+
+TRAINING_DIR = str(Path(__file__).resolve().parent.parent / "training")
+
+# Appended, so a backend module of the same name always wins
+if TRAINING_DIR not in sys.path:
+    sys.path.append(TRAINING_DIR)
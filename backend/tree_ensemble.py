@@ -0,0 +1,327 @@
+"""
+Array-backed tree ensembles for serving the XGBoost and RandomForest
+models.
+
+Every tree of a fitted model is flattened into one set of contiguous
+node arrays (split feature, float32 threshold, left/right children,
+default direction for NaN, leaf values), saved as a shared_arrays bundle
+and memory-mapped by every worker. Prediction walks all trees for all
+rows at once in NumPy, a few flat gathers per depth level, instead of
+paying sklearn's per-call validation and thread-pool dispatch, and there
+is no 400-tree object graph to unpickle at startup.
+
+Both formats use one rule, `x < threshold` goes left. XGBoost already
+splits that way on float32 thresholds; sklearn's `x <= t` (t float64,
+x float32) is converted exactly by storing the smallest float32 above t.
+Leaves point to themselves, so walking max_depth levels lands every row
+on its leaf whatever the depth of the individual path.
+
+Every batch size goes through this evaluator, although the libraries
+overtake it on large batches (one core: native XGBoost from ~50 rows on
+the 600-tree model, sklearn's forest from ~700). Switching by batch
+size would let a county's rounded forecast depend on what it was
+batched with, since XGBoost sums leaves in float32 in its own order
+(differences up to ~3e-3), and every worker would again hold an
+unpickled copy of the model. Batches past the crossover are the
+offline and Monte Carlo paths, not request latency.
+
+benchmark_suite.py checks parity with sklearn and XGBoost (parity phase).
+
+Bundles are built on first load, or ahead of time for all workers
+(from backend/):
+    python shared_arrays.py
+"""
+
+import json
+
+import numpy as np
+
+# XGBoost objectives whose prediction is the raw margin (identity link)
+XGB_IDENTITY_OBJECTIVES = {
+    "reg:squarederror",
+    "reg:absoluteerror",
+    "reg:pseudohubererror",
+    "reg:quantileerror",
+}
+
+
+class TreeEnsemble:
+    """
+    Flattened ensemble: node arrays for all trees back to back, the root
+    node of each tree, and how leaf values combine into predictions.
+
+    value holds either one column per output (sklearn, every tree
+    predicts every output) or a single column with tree_output naming
+    the output each tree contributes to (XGBoost multi-target).
+    """
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        # (nodes, 2): left, right; flattened so node * 2 + go_right indexes it
+        self.children = arrays["children"].reshape(-1)
+        self.default_left = arrays["default_left"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+
+        self.kind = meta["kind"]
+        self.max_depth = meta["max_depth"]
+        self.n_features = meta["n_features"]
+        self.n_outputs = meta["n_outputs"]
+        # Quantile levels of the outputs of a quantile-regression model
+        self.quantiles = meta.get("quantiles")
+
+        # (trees * width, outputs) weights taking per-tree leaf values to
+        # outputs; covers the RF mean and the XGBoost per-target sums
+        n_trees = len(self.roots)
+        width = self.value.shape[1]
+        if width == self.n_outputs:
+            combine = np.tile(np.eye(width), (n_trees, 1))
+        else:
+            combine = np.zeros((n_trees, self.n_outputs))
+            combine[np.arange(n_trees), arrays["tree_output"]] = 1.0
+        self._combine = combine * meta["scale"]
+        self._base = np.asarray(meta["base_score"], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.roots)
+
+    def leaves(self, X, trees=None):
+        """
+        Leaf node index reached in every tree, shape (rows, trees), or
+        with `trees` ((rows, k) tree indices) only in those trees of
+        each row, shape (rows, k).
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected a (rows, {self.n_features}) feature matrix, got {X.shape}"
+            )
+
+        has_nan = bool(np.isnan(X).any())
+        flat = X.reshape(-1)
+        row_offset = (np.arange(len(X), dtype=np.int32) * self.n_features)[:, None]
+        if trees is None:
+            node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        else:
+            node = np.take(self.roots, trees)
+
+        for _ in range(self.max_depth):
+            x = np.take(flat, np.take(self.feature, node) + row_offset)
+            go_right = x >= np.take(self.threshold, node)
+            if has_nan:
+                go_right = np.where(np.isnan(x), ~np.take(self.default_left, node), go_right)
+            node = np.take(self.children, 2 * node + go_right)
+
+        return node
+
+    def tree_values(self, X, trees=None):
+        """
+        Per-tree leaf values, shape (rows, trees, width); see leaves()
+        for `trees`.
+        """
+        return np.take(self.value, self.leaves(X, trees), axis=0)
+
+    def predict(self, X):
+        """
+        Predictions for a float32 feature matrix: shape (rows,) for a
+        single-output model, (rows, outputs) otherwise.
+        """
+        return self.combine(self.tree_values(X))
+
+    def combine(self, values):
+        """
+        Predictions from tree_values() over all trees.
+        """
+        preds = values.reshape(len(values), -1).astype(np.float64) @ self._combine + self._base
+
+        if self.n_outputs == 1:
+            return preds[:, 0]
+        return preds
+
+
+# ---------------------------
+# Flattening
+# ---------------------------
+def _concat(trees, n_features, n_outputs, kind, scale, base_score, tree_output=None):
+    """
+    Stack per-tree node arrays into one ensemble, offsetting child and
+    root indices; leaves (left == -1) become self-loops.
+    """
+    offsets = np.cumsum([0] + [len(tree["feature"]) for tree in trees])
+
+    feature, threshold, children, default_left, value = [], [], [], [], []
+    max_depth = 0
+
+    for offset, tree in zip(offsets, trees):
+        n_nodes = len(tree["feature"])
+        own = np.arange(n_nodes) + offset
+        leaf = tree["left"] < 0
+
+        feature.append(np.where(leaf, 0, tree["feature"]))
+        threshold.append(np.where(leaf, 0, tree["threshold"]))
+        children.append(np.stack([
+            np.where(leaf, own, tree["left"] + offset),
+            np.where(leaf, own, tree["right"] + offset),
+        ], axis=1))
+        default_left.append(tree["default_left"])
+        value.append(tree["value"])
+        max_depth = max(max_depth, _depth(tree["left"], tree["right"]))
+
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float32),
+        "children": np.concatenate(children).astype(np.int32),
+        "default_left": np.concatenate(default_left).astype(bool),
+        "value": np.concatenate(value).astype(np.float32),
+        "roots": offsets[:-1].astype(np.int32),
+    }
+    if tree_output is not None:
+        arrays["tree_output"] = np.asarray(tree_output, dtype=np.int32)
+
+    meta = {
+        "kind": kind,
+        "max_depth": int(max_depth),
+        "n_features": int(n_features),
+        "n_outputs": int(n_outputs),
+        "scale": float(scale),
+        "base_score": [float(b) for b in base_score],
+    }
+    return arrays, meta
+
+
+def _depth(left, right):
+    """
+    Number of splits on the longest root-to-leaf path (root is node 0).
+    """
+    depth = np.zeros(len(left), dtype=np.int64)
+    level = np.array([0])
+    d = 0
+    while len(level):
+        depth[level] = d
+        internal = level[left[level] >= 0]
+        level = np.concatenate([left[internal], right[internal]])
+        d += 1
+    return int(depth.max())
+
+
+def _float32_above(threshold):
+    """
+    Smallest float32 strictly greater than each float64 threshold, so
+    that for float32 x: x <= t  <=>  x < result.
+    """
+    t32 = threshold.astype(np.float32)
+    below = t32.astype(np.float64) <= threshold
+    t32[below] = np.nextafter(t32[below], np.float32(np.inf))
+    return t32
+
+
+def flatten_random_forest(model):
+    """
+    Flatten a fitted sklearn forest (or single tree) regressor.
+    """
+    estimators = getattr(model, "estimators_", [model])
+    n_outputs = model.n_outputs_
+
+    trees = []
+    for estimator in estimators:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int64)
+        missing_left = getattr(tree, "missing_go_to_left", None)
+
+        trees.append({
+            "feature": tree.feature,
+            "threshold": _float32_above(tree.threshold),
+            "left": left,
+            "right": tree.children_right.astype(np.int64),
+            "default_left": (
+                missing_left.astype(bool) if missing_left is not None
+                else np.zeros(len(left), dtype=bool)
+            ),
+            "value": tree.value[:, :n_outputs, 0],
+        })
+
+    return _concat(
+        trees,
+        n_features=model.n_features_in_,
+        n_outputs=n_outputs,
+        kind="random_forest",
+        scale=1.0 / len(estimators),
+        base_score=np.zeros(n_outputs),
+    )
+
+
+def _xgb_floats(raw):
+    # Scalars and vectors ("[1E-1,9E-1]") as saved in the model JSON
+    return [float(v) for v in str(raw).strip("[]").split(",")]
+
+
+def flatten_xgboost(model):
+    """
+    Flatten a fitted XGBRegressor (or Booster) with an identity-link
+    objective and numeric splits.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+
+    objective = learner["objective"]["name"]
+    if objective not in XGB_IDENTITY_OBJECTIVES:
+        raise ValueError(f"Unsupported XGBoost objective for flattening: {objective}")
+
+    gbm = learner["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise ValueError(f"Unsupported XGBoost booster for flattening: {gbm['name']}")
+
+    n_outputs = max(int(learner["learner_model_param"].get("num_target", 1)), 1)
+    base_score = _xgb_floats(learner["learner_model_param"]["base_score"])
+    if len(base_score) == 1:
+        base_score = base_score * n_outputs
+
+    trees = []
+    for tree in gbm["model"]["trees"]:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        if int(tree["tree_param"].get("size_leaf_vector", 1)) > 1:
+            raise ValueError("Vector-leaf XGBoost trees are not supported")
+
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        trees.append({
+            "feature": np.asarray(tree["split_indices"], dtype=np.int64),
+            # Leaves keep their value in split_conditions
+            "threshold": np.asarray(tree["split_conditions"], dtype=np.float32),
+            "left": left,
+            "right": np.asarray(tree["right_children"], dtype=np.int64),
+            "default_left": np.asarray(tree["default_left"], dtype=bool),
+            "value": np.asarray(tree["split_conditions"], dtype=np.float32)[:, None],
+        })
+
+    arrays, meta = _concat(
+        trees,
+        n_features=int(learner["learner_model_param"]["num_feature"]),
+        n_outputs=n_outputs,
+        kind="xgboost",
+        scale=1.0,
+        base_score=base_score,
+        tree_output=gbm["model"]["tree_info"],
+    )
+
+    if objective == "reg:quantileerror":
+        meta["quantiles"] = _xgb_floats(
+            learner["objective"]["quantile_loss_param"]["quantile_alpha"]
+        )
+
+    return arrays, meta
+
+
+def flatten_model(model):
+    """
+    (arrays, meta) for a fitted XGBoost or sklearn tree model.
+    """
+    if hasattr(model, "get_booster") or type(model).__name__ == "Booster":
+        return flatten_xgboost(model)
+    if hasattr(model, "estimators_") or hasattr(model, "tree_"):
+        return flatten_random_forest(model)
+    raise ValueError(f"Cannot flatten model of type {type(model).__name__}")
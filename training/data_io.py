@@ -0,0 +1,96 @@
+"""
+Dataset loading shared by the training scripts and the backend.
+
+preprocessed_ev_data.csv is converted once into an uncompressed Arrow IPC
+(Feather v2) file sorted by (County, Date). Readers memory-map that file
+and decode only the columns they ask for; the CSV stays the source of
+truth and is used whenever the Arrow copy is missing or older than it.
+
+Convert (from training/, after regenerating the CSV):
+    python data_io.py
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from feature_config import DATE_COLUMN
+
+# ---------------------------
+# Paths
+# ---------------------------
+DATA_DIR = Path(os.environ.get("EV_BASE_DIR") or Path(__file__).resolve().parent.parent) / "data"
+CSV_PATH = DATA_DIR / "preprocessed_ev_data.csv"
+ARROW_PATH = DATA_DIR / "preprocessed_ev_data.arrow"
+
+COUNTY_COLUMN = "County"
+
+
+def _arrow_is_current():
+    if not ARROW_PATH.exists():
+        return False
+    if not CSV_PATH.exists():
+        return True
+    return ARROW_PATH.stat().st_mtime_ns >= CSV_PATH.stat().st_mtime_ns
+
+
+def _feather():
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+def dataset_path():
+    """
+    The file load_dataset() reads: the Arrow copy when it is usable,
+    otherwise the CSV.
+    """
+    if _arrow_is_current() and _feather() is not None:
+        return ARROW_PATH
+    return CSV_PATH
+
+
+def load_dataset(columns=None):
+    """
+    Load the preprocessed dataset as a DataFrame, optionally only `columns`.
+
+    Rows come back sorted by (County, Date) from the Arrow copy; the CSV
+    fallback keeps file order, so callers that need an order still sort.
+    """
+    path = dataset_path()
+
+    if path == ARROW_PATH:
+        table = _feather().read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas()
+
+    parse_dates = None
+    if columns is None or DATE_COLUMN in columns:
+        parse_dates = [DATE_COLUMN]
+    return pd.read_csv(path, usecols=columns, parse_dates=parse_dates)
+
+
+def convert_csv_to_arrow():
+    """
+    Write ARROW_PATH from CSV_PATH, sorted by (County, Date), atomically.
+    """
+    feather = _feather()
+    if feather is None:
+        raise RuntimeError("pyarrow is required to convert the dataset")
+
+    df = pd.read_csv(CSV_PATH, parse_dates=[DATE_COLUMN])
+    df = df.sort_values([COUNTY_COLUMN, DATE_COLUMN], kind="stable").reset_index(drop=True)
+
+    # Uncompressed, so readers can map the columns without decoding
+    tmp_path = ARROW_PATH.with_suffix(".arrow.tmp")
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    tmp_path.replace(ARROW_PATH)
+
+    return len(df)
+
+
+if __name__ == "__main__":
+    rows = convert_csv_to_arrow()
+    print(f"✅ Wrote {rows} rows to {ARROW_PATH}")
@@ -0,0 +1,185 @@
+"""
+The one definition of the model features, shared by training and serving.
+
+Every value-derived feature for a month is a function of the window of
+values before it (oldest first): window_features() computes them for
+many windows at once. build_features() turns the base dataset into the
+training matrix in one grouped pass; backend/feature_builder.FeatureBuffer
+seeds its windows the same way and applies the same formulas step by step.
+
+Direct multi-horizon models use the same features with lead_windows()
+targets: the values of the row's month and the horizon - 1 after it.
+"""
+
+import numpy as np
+
+from feature_config import FEATURE_COLUMNS, TARGET_COLUMN, DATE_COLUMN
+from data_io import COUNTY_COLUMN
+
+# Months of history behind lags, rolling mean and growth slope
+FEATURE_WINDOW = 6
+
+# Columns build_features() needs from the dataset
+BASE_COLUMNS = [COUNTY_COLUMN, DATE_COLUMN, TARGET_COLUMN, "months_since_start", "county_encoded"]
+
+# Columns computed from the window, in FEATURE_COLUMNS order
+WINDOW_FEATURE_COLUMNS = [
+    "ev_total_lag1",
+    "ev_total_lag2",
+    "ev_total_lag3",
+    "ev_total_roll_mean_3",
+    "ev_total_pct_change_1",
+    "ev_total_pct_change_3",
+    "ev_growth_slope",
+]
+
+
+def growth_slope_weights(n):
+    """
+    Closed-form least-squares slope weights for x = 0..n-1.
+
+    weights @ y equals np.polyfit(range(n), y, 1)[0].
+    """
+    if n < 3:
+        return np.zeros(n)
+
+    x = np.arange(n, dtype=np.float64)
+    x -= x.mean()
+    return x / (x @ x)
+
+
+def lag_windows(values, groups, window=FEATURE_WINDOW):
+    """
+    (rows, window) matrix whose row t holds the `window` values before t
+    within its group, oldest first, left-padded with NaN.
+
+    Rows must already be sorted by group, then date.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups)
+    n = len(values)
+
+    index = np.arange(n)
+    starts = np.r_[True, groups[1:] != groups[:-1]] if n else np.zeros(0, dtype=bool)
+    position = index - np.maximum.accumulate(np.where(starts, index, 0))
+
+    windows = np.full((n, window), np.nan)
+    for k in range(1, window + 1):
+        valid = position >= k
+        windows[valid, window - k] = values[index[valid] - k]
+
+    return windows
+
+
+def lead_windows(values, groups, horizon):
+    """
+    (rows, horizon) matrix whose row t holds the values at t, t+1, ...,
+    t+horizon-1 within its group, right-padded with NaN.
+
+    Rows must already be sorted by group, then date.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups)
+    n = len(values)
+
+    index = np.arange(n)
+    ends = np.r_[groups[1:] != groups[:-1], True] if n else np.zeros(0, dtype=bool)
+    last = np.minimum.accumulate(np.where(ends, index, n)[::-1])[::-1]
+    remaining = last - index
+
+    leads = np.full((n, horizon), np.nan)
+    for k in range(horizon):
+        valid = remaining >= k
+        leads[valid, k] = values[index[valid] + k]
+
+    return leads
+
+
+def direct_target_columns(horizon):
+    return [f"target_h{h}" for h in range(1, horizon + 1)]
+
+
+def lag_features(lag1, lag2, lag3):
+    """
+    The first six WINDOW_FEATURE_COLUMNS (lags, 3-month mean, 1- and
+    3-month pct change) from the last three values, shape (N, 6). A pct
+    change with a zero base is 0. Shared by window_features and serving's
+    FeatureBuffer.
+    """
+    lag1, lag2, lag3 = (np.asarray(lag, dtype=np.float64) for lag in (lag1, lag2, lag3))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.stack([
+            lag1,
+            lag2,
+            lag3,
+            (lag1 + lag2 + lag3) / 3,
+            np.where(lag2 != 0, (lag1 - lag2) / lag2, 0.0),
+            np.where(lag3 != 0, (lag1 - lag3) / lag3, 0.0),
+        ], axis=1)
+
+
+def window_features(windows):
+    """
+    Value-derived features (WINDOW_FEATURE_COLUMNS order) for each row of
+    an (N, W) window matrix. Missing history is NaN on the left; rows with
+    fewer than 3 values get NaN lags.
+    """
+    windows = np.asarray(windows, dtype=np.float64)
+    n_rows, window = windows.shape
+
+    out = np.empty((n_rows, len(WINDOW_FEATURE_COLUMNS)))
+    out[:, :6] = lag_features(windows[:, -1], windows[:, -2], windows[:, -3])
+
+    # Slope of the cumulative series over however much history each row has
+    available = np.count_nonzero(~np.isnan(windows), axis=1)
+    cumulative = np.nancumsum(windows, axis=1)
+
+    slope = np.zeros(n_rows)
+    for n in range(3, window + 1):
+        rows = available == n
+        if rows.any():
+            slope[rows] = cumulative[rows, window - n:] @ growth_slope_weights(n)
+    out[:, 6] = slope
+
+    return out
+
+
+def build_features(df, window=FEATURE_WINDOW):
+    """
+    Return df sorted by (County, Date) with every FEATURE_COLUMNS column
+    (re)computed from BASE_COLUMNS. Rows without 3 months of history have
+    NaN lags.
+    """
+    frame = df.sort_values([COUNTY_COLUMN, DATE_COLUMN], kind="stable").reset_index(drop=True)
+
+    windows = lag_windows(
+        frame[TARGET_COLUMN].to_numpy(dtype=np.float64),
+        frame[COUNTY_COLUMN].to_numpy(),
+        window,
+    )
+    features = window_features(windows)
+
+    frame = frame.assign(
+        year=frame[DATE_COLUMN].dt.year,
+        month=frame[DATE_COLUMN].dt.month,
+        **{name: features[:, i] for i, name in enumerate(WINDOW_FEATURE_COLUMNS)},
+    )
+
+    return frame[[c for c in frame.columns if c not in FEATURE_COLUMNS] + FEATURE_COLUMNS]
+
+
+def build_direct_targets(frame, horizon):
+    """
+    Columns direct_target_columns(horizon) for a build_features() frame:
+    target_h{h} is the value h - 1 months after the row's month, which
+    the row's features (everything known before that month) predict.
+    NaN where the county's series ends first.
+    """
+    leads = lead_windows(
+        frame[TARGET_COLUMN].to_numpy(dtype=np.float64),
+        frame[COUNTY_COLUMN].to_numpy(),
+        horizon,
+    )
+    columns = direct_target_columns(horizon)
+    return frame.assign(**dict(zip(columns, leads.T)))[columns]
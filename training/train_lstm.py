@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import joblib
 from sklearn.preprocessing import MinMaxScaler
@@ -9,11 +8,11 @@ from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping
 
 from feature_config import TARGET_COLUMN, DATE_COLUMN
+from data_io import COUNTY_COLUMN, load_dataset
 
 # ---------------------------
 # Config
 # ---------------------------
-DATA_PATH = "../data/preprocessed_ev_data.csv"
 MODEL_PATH = "../models/lstm_ev_model.h5"
 SCALER_PATH = "../models/lstm_scaler.pkl"
 
@@ -24,8 +23,9 @@ BATCH_SIZE = 32
 # ---------------------------
 # Load & prepare data
 # ---------------------------
-df = pd.read_csv(DATA_PATH, parse_dates=[DATE_COLUMN])
-df = df.sort_values(DATE_COLUMN)
+df = load_dataset([COUNTY_COLUMN, DATE_COLUMN, TARGET_COLUMN])
+# Explicit tie-break: the same sequence from the Arrow copy and the CSV
+df = df.sort_values([DATE_COLUMN, COUNTY_COLUMN], kind="stable")
 
 values = df[TARGET_COLUMN].values.reshape(-1, 1)
 
@@ -1,42 +1,58 @@
 import pandas as pd
-import pickle
 import numpy as np
+import argparse
+import hashlib
+import json
+import os
+import re
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 from prophet import Prophet
+from prophet.serialize import model_to_json
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from feature_config import TARGET_COLUMN, DATE_COLUMN
+from data_io import load_dataset
 
 # ---------------------------
 # Config
 # ---------------------------
-DATA_PATH = "../data/preprocessed_ev_data.csv"
-MODEL_PATH = "../models/prophet_models.pkl"
+MODEL_DIR = Path("../models/prophet")          # one JSON model per county
+MANIFEST_PATH = MODEL_DIR / "manifest.json"    # county -> file index
 
 # Optional: silence noisy future warnings (safe)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-# ---------------------------
-# Load data
-# ---------------------------
-df = pd.read_csv(DATA_PATH, parse_dates=[DATE_COLUMN])
 
-models = {}
-metrics = []
+def county_data_hash(prophet_df):
+    """
+    Content hash of a county's (ds, y) series; unchanged data means the
+    existing model can be kept in incremental mode.
+    """
+    hashed = pd.util.hash_pandas_object(prophet_df, index=False)
+    return hashlib.sha256(hashed.values.tobytes()).hexdigest()
 
-# ---------------------------
-# Train one Prophet model per county
-# ---------------------------
-for county, county_df in df.groupby("County"):
-    county_df = county_df.sort_values(DATE_COLUMN)
 
-    # Skip very short time series
-    if len(county_df) < 24:
-        continue
+def county_filename(county, taken):
+    """
+    Filesystem-safe file name for a county's model, unique within `taken`.
+    """
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", county).strip("_") or "county"
+    name = f"{slug}.json"
+    suffix = 1
+    while name in taken:
+        suffix += 1
+        name = f"{slug}_{suffix}.json"
+    return name
 
-    prophet_df = county_df[[DATE_COLUMN, TARGET_COLUMN]].rename(
-        columns={DATE_COLUMN: "ds", TARGET_COLUMN: "y"}
-    )
+
+def train_county(county, prophet_df):
+    """
+    Fit and evaluate one county's Prophet model (runs in a worker process).
+    Returns (county, serialized model, metrics).
+    """
+    warnings.filterwarnings("ignore", category=FutureWarning)
 
     # Time-based split (last 12 months for testing)
     train_df = prophet_df.iloc[:-12]
@@ -74,27 +90,147 @@ for county, county_df in df.groupby("County"):
     else:
         mape = np.nan  # undefined but safe
 
-    metrics.append({
-        "County": county,
-        "MAE": mae,
-        "RMSE": rmse,
-        "MAPE": mape
-    })
+    metrics = {
+        "MAE": float(mae),
+        "RMSE": float(rmse),
+        "MAPE": None if np.isnan(mape) else float(mape),
+    }
 
-    models[county] = model
+    return county, model_to_json(model), metrics
 
-# ---------------------------
-# Save all county models
-# ---------------------------
-with open(MODEL_PATH, "wb") as f:
-    pickle.dump(models, f)
 
-# ---------------------------
-# Aggregate performance
-# ---------------------------
-metrics_df = pd.DataFrame(metrics)
+def load_manifest():
+    if not MANIFEST_PATH.exists():
+        return {}
+    with open(MANIFEST_PATH) as f:
+        return json.load(f)["counties"]
+
+
+def save_manifest(manifest):
+    # Write-then-rename so loaders never see a partial index
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"format": "prophet-json", "counties": manifest}, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train one Prophet model per county")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(),
+        help="worker processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="only refit counties whose data changed since the last run",
+    )
+    args = parser.parse_args()
+
+    # ---------------------------
+    # Load data
+    # ---------------------------
+    df = load_dataset(["County", DATE_COLUMN, TARGET_COLUMN])
+
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest()
+    manifest = {}
+    jobs = {}
+    unchanged = 0
+
+    for county, county_df in df.groupby("County"):
+        county_df = county_df.sort_values(DATE_COLUMN)
+
+        # Skip very short time series
+        if len(county_df) < 24:
+            continue
+
+        prophet_df = county_df[[DATE_COLUMN, TARGET_COLUMN]].rename(
+            columns={DATE_COLUMN: "ds", TARGET_COLUMN: "y"}
+        ).reset_index(drop=True)
+
+        data_hash = county_data_hash(prophet_df)
+        entry = previous.get(county)
+
+        if entry is not None and (MODEL_DIR / entry["file"]).exists():
+            # Keep serving the previous model until its replacement is saved
+            manifest[county] = entry
+
+            if args.incremental and entry.get("data_hash") == data_hash:
+                unchanged += 1
+                continue
+
+        jobs[county] = (prophet_df, data_hash)
+
+    print(f"Training {len(jobs)} counties ({unchanged} unchanged) on {args.workers} workers")
+
+    taken = {entry["file"] for entry in manifest.values()}
+
+    # ---------------------------
+    # Train one Prophet model per county, saving each as it finishes
+    # ---------------------------
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(train_county, county, prophet_df)
+            for county, (prophet_df, _) in jobs.items()
+        ]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            county, model_json, metrics = future.result()
+            prophet_df, data_hash = jobs[county]
+
+            if county in manifest:
+                filename = manifest[county]["file"]
+            else:
+                filename = county_filename(county, taken)
+                taken.add(filename)
+
+            # Write-then-rename: a server lazily loading this county keeps
+            # reading the previous file until the new one is complete
+            tmp_path = MODEL_DIR / f"{filename}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(model_json)
+            os.replace(tmp_path, MODEL_DIR / filename)
+
+            manifest[county] = {
+                "file": filename,
+                "rows": int(len(prophet_df)),
+                "last_date": prophet_df["ds"].max().strftime("%Y-%m-%d"),
+                "data_hash": data_hash,
+                "metrics": metrics,
+            }
+
+            # Persist progress so an interrupted run resumes incrementally
+            save_manifest(manifest)
+
+            print(f"[{done}/{len(jobs)}] {county}")
+
+    # ---------------------------
+    # Drop models for counties no longer in the data
+    # ---------------------------
+    for county, entry in previous.items():
+        if county not in manifest and entry["file"] not in taken:
+            (MODEL_DIR / entry["file"]).unlink(missing_ok=True)
+
+    save_manifest(manifest)
+
+    # ---------------------------
+    # Aggregate performance
+    # ---------------------------
+    metrics_df = pd.DataFrame(
+        [
+            {"County": county, **entry["metrics"]}
+            for county, entry in manifest.items()
+            if entry.get("metrics")
+        ],
+        columns=["County", "MAE", "RMSE", "MAPE"],
+    ).astype({"MAPE": float})
+
+    print("\n📈 PROPHET PERFORMANCE (AVERAGE)")
+    print(metrics_df[["MAE", "RMSE", "MAPE"]].mean(skipna=True))
+
+    print(f"\n✅ {len(manifest)} Prophet models saved to {MODEL_DIR}")
 
-print("\n📈 PROPHET PERFORMANCE (AVERAGE)")
-print(metrics_df[["MAE", "RMSE", "MAPE"]].mean(skipna=True))
 
-print(f"\n✅ Prophet models saved to {MODEL_PATH}")
+if __name__ == "__main__":
+    main()
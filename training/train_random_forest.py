@@ -1,33 +1,57 @@
-import pandas as pd
+import argparse
+
 import joblib
+import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 
 from feature_config import FEATURE_COLUMNS, TARGET_COLUMN, DATE_COLUMN
+from data_io import COUNTY_COLUMN, load_dataset
+from features import BASE_COLUMNS, build_direct_targets, build_features
 
 # ---------------------------
 # Load data
 # ---------------------------
-DATA_PATH = "../data/preprocessed_ev_data.csv"
 MODEL_PATH = "../models/random_forest_ev_model.pkl"
+# --direct H: one multi-output model for months 1..H (served as random_forest_direct)
+DIRECT_MODEL_PATH = "../models/random_forest_ev_direct.pkl"
+
+parser = argparse.ArgumentParser(description="Train the random forest model")
+parser.add_argument(
+    "--direct", type=int, default=0, metavar="HORIZON",
+    help="predict the next HORIZON months at once from the last observed state "
+         "instead of one month per recursive step",
+)
+args = parser.parse_args()
+horizon = args.direct or 1
 
-df = pd.read_csv(DATA_PATH, parse_dates=[DATE_COLUMN])
-df = df.sort_values(DATE_COLUMN)
+# Features are rebuilt from the base columns with the definition serving uses
+df = build_features(load_dataset(BASE_COLUMNS))
+target_columns = [TARGET_COLUMN]
+if args.direct:
+    targets = build_direct_targets(df, args.direct)
+    target_columns = list(targets.columns)
+    df = df.join(targets)
+# Explicit tie-break: the same row order from the Arrow copy and the CSV
+df = df.sort_values([DATE_COLUMN, COUNTY_COLUMN], kind="stable")
 
-df = df.dropna(subset=FEATURE_COLUMNS + [TARGET_COLUMN])
+df = df.dropna(subset=FEATURE_COLUMNS + target_columns)
 
 X = df[FEATURE_COLUMNS]
-y = df[TARGET_COLUMN]
+y = df[target_columns] if args.direct else df[TARGET_COLUMN]
 
 # ---------------------------
 # Time-based split
 # ---------------------------
 split_date = df[DATE_COLUMN].quantile(0.85)
+# Direct targets run horizon - 1 months past their row; keep them all
+# before the split
+train_end = split_date - pd.DateOffset(months=horizon - 1)
 
-X_train = X[df[DATE_COLUMN] <= split_date]
+X_train = X[df[DATE_COLUMN] <= train_end]
 X_test  = X[df[DATE_COLUMN] > split_date]
 
-y_train = y[df[DATE_COLUMN] <= split_date]
+y_train = y[df[DATE_COLUMN] <= train_end]
 y_test  = y[df[DATE_COLUMN] > split_date]
 
 # ---------------------------
@@ -53,14 +77,22 @@ mae = mean_absolute_error(y_test, y_pred)
 mse = mean_squared_error(y_test, y_pred)
 rmse = mse ** 0.5
 mape = (abs((y_test - y_pred) / y_test).replace([float("inf")], 0)).mean() * 100
+if args.direct:
+    # Averaged over every horizon month
+    mape = mape.mean()
 
-print("\n📈 RANDOM FOREST PERFORMANCE")
+title = "RANDOM FOREST PERFORMANCE" + (f" (direct, {args.direct} months)" if args.direct else "")
+print(f"\n📈 {title}")
 print(f"MAE  : {mae:.2f}")
 print(f"RMSE : {rmse:.2f}")
 print(f"MAPE : {mape:.2f}%")
+if args.direct:
+    by_month = mean_absolute_error(y_test, y_pred, multioutput="raw_values")
+    print("MAE by month: " + ", ".join(f"h{h}={v:.2f}" for h, v in enumerate(by_month, 1)))
 
 # ---------------------------
 # Save model
 # ---------------------------
-joblib.dump(rf, MODEL_PATH)
-print(f"\n✅ Model saved to {MODEL_PATH}")
+model_path = DIRECT_MODEL_PATH if args.direct else MODEL_PATH
+joblib.dump(rf, model_path)
+print(f"\n✅ Model saved to {model_path}")
@@ -1,35 +1,62 @@
-import pandas as pd
+import argparse
+
 import joblib
+import pandas as pd
 import xgboost as xgb
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from sklearn.model_selection import train_test_split
 
 from feature_config import FEATURE_COLUMNS, TARGET_COLUMN, DATE_COLUMN
+from data_io import COUNTY_COLUMN, load_dataset
+from features import BASE_COLUMNS, build_direct_targets, build_features
 
 # ---------------------------
 # Load data
 # ---------------------------
-DATA_PATH = "../data/preprocessed_ev_data.csv"
 MODEL_PATH = "../models/xgboost_ev_model.pkl"
-
-df = pd.read_csv(DATA_PATH, parse_dates=[DATE_COLUMN])
-df = df.sort_values(DATE_COLUMN)
+# --direct H: one multi-output model for months 1..H (served as xgboost_direct)
+DIRECT_MODEL_PATH = "../models/xgboost_ev_direct.pkl"
+# 10th/90th percentile model behind the xgboost prediction intervals
+QUANTILE_MODEL_PATH = "../models/xgboost_ev_quantiles.pkl"
+QUANTILES = [0.1, 0.9]
+
+parser = argparse.ArgumentParser(description="Train the xgboost model")
+parser.add_argument(
+    "--direct", type=int, default=0, metavar="HORIZON",
+    help="predict the next HORIZON months at once from the last observed state "
+         "instead of one month per recursive step",
+)
+args = parser.parse_args()
+horizon = args.direct or 1
+
+# Features are rebuilt from the base columns with the definition serving uses
+df = build_features(load_dataset(BASE_COLUMNS))
+target_columns = [TARGET_COLUMN]
+if args.direct:
+    targets = build_direct_targets(df, args.direct)
+    target_columns = list(targets.columns)
+    df = df.join(targets)
+# Explicit tie-break: the same row order from the Arrow copy and the CSV
+df = df.sort_values([DATE_COLUMN, COUNTY_COLUMN], kind="stable")
 
 # Drop rows with missing feature values
-df = df.dropna(subset=FEATURE_COLUMNS + [TARGET_COLUMN])
+df = df.dropna(subset=FEATURE_COLUMNS + target_columns)
 
 X = df[FEATURE_COLUMNS]
-y = df[TARGET_COLUMN]
+y = df[target_columns] if args.direct else df[TARGET_COLUMN]
 
 # ---------------------------
 # Time-based train/test split
 # ---------------------------
 split_date = df[DATE_COLUMN].quantile(0.85)
+# Direct targets run horizon - 1 months past their row; keep them all
+# before the split
+train_end = split_date - pd.DateOffset(months=horizon - 1)
 
-X_train = X[df[DATE_COLUMN] <= split_date]
+X_train = X[df[DATE_COLUMN] <= train_end]
 X_test  = X[df[DATE_COLUMN] > split_date]
 
-y_train = y[df[DATE_COLUMN] <= split_date]
+y_train = y[df[DATE_COLUMN] <= train_end]
 y_test  = y[df[DATE_COLUMN] > split_date]
 
 print(f"Train size: {X_train.shape}")
@@ -38,17 +65,18 @@ print(f"Test size : {X_test.shape}")
 # ---------------------------
 # XGBoost Model (TUNED)
 # ---------------------------
-model = xgb.XGBRegressor(
+PARAMS = dict(
     n_estimators=600,
     max_depth=8,
     learning_rate=0.05,
     subsample=0.85,
     colsample_bytree=0.85,
-    objective="reg:squarederror",
     random_state=42,
     n_jobs=-1
 )
 
+model = xgb.XGBRegressor(objective="reg:squarederror", **PARAMS)
+
 # Train
 model.fit(
     X_train,
@@ -66,15 +94,40 @@ mae = mean_absolute_error(y_test, y_pred)
 mse = mean_squared_error(y_test, y_pred)
 rmse = mse ** 0.5
 mape = (abs((y_test - y_pred) / y_test).replace([float("inf")], 0)).mean() * 100
+if args.direct:
+    # Averaged over every horizon month
+    mape = mape.mean()
 
-print("\n📈 XGBOOST PERFORMANCE")
+title = "XGBOOST PERFORMANCE" + (f" (direct, {args.direct} months)" if args.direct else "")
+print(f"\n📈 {title}")
 print(f"MAE  : {mae:.2f}")
 print(f"RMSE : {rmse:.2f}")
 print(f"MAPE : {mape:.2f}%")
+if args.direct:
+    by_month = mean_absolute_error(y_test, y_pred, multioutput="raw_values")
+    print("MAE by month: " + ", ".join(f"h{h}={v:.2f}" for h, v in enumerate(by_month, 1)))
 
 
 # ---------------------------
 # Save model
 # ---------------------------
-joblib.dump(model, MODEL_PATH)
-print(f"\n✅ Model saved to {MODEL_PATH}")
+model_path = DIRECT_MODEL_PATH if args.direct else MODEL_PATH
+joblib.dump(model, model_path)
+print(f"\n✅ Model saved to {model_path}")
+
+
+# ---------------------------
+# Quantile model (prediction intervals)
+# ---------------------------
+if not args.direct:
+    quantile_model = xgb.XGBRegressor(
+        objective="reg:quantileerror", quantile_alpha=QUANTILES, **PARAMS
+    )
+    quantile_model.fit(X_train, y_train, verbose=False)
+
+    bounds = quantile_model.predict(X_test)
+    inside = ((y_test >= bounds[:, 0]) & (y_test <= bounds[:, -1])).mean() * 100
+    print(f"\n📈 QUANTILES {QUANTILES[0]:g}-{QUANTILES[-1]:g}: test coverage {inside:.1f}%")
+
+    joblib.dump(quantile_model, QUANTILE_MODEL_PATH)
+    print(f"✅ Quantile model saved to {QUANTILE_MODEL_PATH}")